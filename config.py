@@ -19,23 +19,45 @@ for k in core_config_keys:
 extended_config = {
     'APPIMAGE_LINK_SELECTION_NAME': 'selected_wine.AppImage',
     'APPDIR_BINDIR': None,
+    'ARTIFACT_INDEX_FILE': os.path.expanduser("~/.cache/Logos_on_Linux/artifacts.json"),  # noqa: E501
+    'ARTIFACT_SERVER_ADDRESS': '',  # --serve-artifacts; '' is all interfaces
+    'ARTIFACT_SERVER_PORT': 8000,  # for --serve-artifacts
+    'ARTIFACT_STORE': None,  # e.g. ~/.cache/Logos_on_Linux/store; off if unset
     'CHECK_UPDATES': False,
     'CONFIG_FILE': None,
     'CUSTOMBINPATH': None,
     'DEBUG': False,
     'DELETE_LOG': None,
     'DIALOG': None,
+    'DOWNLOAD_MIRRORS': None,  # e.g. https://github.com=http://lan:8000/gh
+    'DOWNLOAD_PEERS': None,  # e.g. http://lab-1:8000,http://lab-2:8000
+    'DOWNLOAD_RATE_LIMIT': None,  # bytes/s, e.g. 500K or 2M
+    'DOWNLOAD_RETRIES': 5,
+    'DOWNLOAD_RETRY_DELAY': 1,  # seconds before the first retry; doubles
+    'DOWNLOAD_SEGMENTS': 4,
+    'DOWNLOAD_WORKERS': 3,  # concurrent background artifact downloads
+    'HASH_CACHE_FILE': os.path.expanduser("~/.cache/Logos_on_Linux/hashes.json"),  # noqa: E501
+    'HTTP_CONNECT_TIMEOUT': 10,  # seconds
+    'HTTP_POOL_SIZE': 8,  # max. kept-alive connections per host
+    'HTTP_READ_TIMEOUT': 30,  # seconds without data before a request fails
     'LOGOS_LOG': os.path.expanduser("~/.local/state/Logos_on_Linux/Logos_on_Linux.log"),  # noqa: E501
     'LOGOS_EXE': None,
     'LOGOS_EXECUTABLE': None,
     'LOGOS_VERSION': None,
     'LOGOS64_MSI': "Logos-x64.msi",
     'LOGOS64_URL': None,
+    'RATE_LIMIT_MAX_WAIT': 60,  # seconds to wait out an API rate limit
     'REINSTALL_DEPENDENCIES': False,
+    'RELEASE_CHECK_TIMEOUT': 10,  # seconds startup waits for release info
+    'RELEASE_LIST_BUDGET': 30,  # seconds to get the list of Logos releases
+    'RESPONSE_CACHE_DIR': os.path.expanduser("~/.cache/Logos_on_Linux/responses"),  # noqa: E501
     'SELECTED_APPIMAGE_FILENAME': None,
     'SKIP_DEPENDENCIES': False,
     'SKIP_FONTS': False,
     'SKIP_WINETRICKS': False,
+    'UPDATE_CHECK_BUDGET': 60,  # seconds for all update check requests
+    'URL_CACHE_FILE': os.path.expanduser("~/.cache/Logos_on_Linux/url_props.json"),  # noqa: E501
+    'URL_CACHE_TTL': 6 * 60 * 60,  # seconds; 0 disables the cache
     'use_python_dialog': None,
     'VERBOSE': False,
     'WINEBIN_CODE': None,
@@ -56,6 +78,7 @@ authenticated = False
 BADPACKAGES = None
 DEFAULT_CONFIG_PATH = os.path.expanduser("~/.config/Logos_on_Linux/Logos_on_Linux.json")  # noqa: E501
 GUI = None
+ICU_URL = None
 INSTALL_STEP = 0
 INSTALL_STEPS_COUNT = 0
 L9PACKAGES = None
@@ -90,6 +113,7 @@ PASSIVE = None
 PRESENT_WORKING_DIRECTORY = os.getcwd()
 QUERY_PREFIX = None
 REBOOT_REQUIRED = None
+RELEASE_INFO_STALE = False  # the update check fell back to cached info
 RECOMMENDED_WINE64_APPIMAGE_FULL_FILENAME = None
 RECOMMENDED_WINE64_APPIMAGE_FULL_VERSION = None
 RECOMMENDED_WINE64_APPIMAGE_FILENAME = None
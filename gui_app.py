@@ -590,6 +590,9 @@ class ControlWindow():
         ver = config.LLI_CURRENT_VERSION
         new = config.LLI_LATEST_VERSION
         text = f"{text}\ncurrent: v{ver}\nlatest: v{new}"
+        if config.RELEASE_INFO_STALE:
+            # The update check ran out of time; this is from an earlier one.
+            text = f"{text} (cached)"
         self.gui.update_lli_label.config(text=text)
         self.configure_app_button()
         self.gui.run_indexing_radio.config(
@@ -11,6 +11,9 @@ import system
 import utils
 import wine
 
+icu_queue_thread = None
+queued_installer_url = None  # product installer queued for the chosen release
+
 # TODO: Fix install progress if user returns to main menu?
 # To replicate, start a TUI install, return/cancel on second step
 # Then launch a new install
@@ -78,6 +81,8 @@ def ensure_release_choice(app=None):
     config.INSTALL_STEP += 1
     update_install_feedback("Choose product release…", app=app)
     logging.debug('- config.TARGET_RELEASE_VERSION')
+    # Drop an installer queued for an earlier choice before asking again.
+    queue_product_installer()
 
     if not config.TARGET_RELEASE_VERSION:
         if app:
@@ -95,6 +100,29 @@ def ensure_release_choice(app=None):
 
     logging.debug(f"> {config.TARGET_RELEASE_VERSION=}")
 
+    # The installer URL is fully determined now; start fetching it while
+    # the remaining questions are answered.
+    queue_product_installer()
+
+
+def queue_product_installer():
+    # Queue the installer for the chosen product, version and release. In
+    # the GUI these can be changed again, which reruns the install steps;
+    # an installer queued for an earlier choice is cancelled so it doesn't
+    # keep a download worker from the artifacts that are still needed.
+    global queued_installer_url
+    url = None
+    if config.TARGET_RELEASE_VERSION:
+        url = get_product_installer_url()
+    if queued_installer_url not in [None, url]:
+        network.download_manager.cancel(queued_installer_url)
+    queued_installer_url = url
+    if url is not None:
+        network.download_manager.queue(
+            url,
+            get_product_installer_name(config.TARGET_RELEASE_VERSION),
+        )
+
 
 def ensure_install_dir_choice(app=None):
     config.INSTALL_STEPS_COUNT += 1
@@ -141,7 +169,14 @@ def ensure_wine_choice(app=None):
     logging.debug('- config.WINEBIN_CODE')
 
     if utils.get_wine_exe_path() is None:
+        network.wait_for_release_config(network.set_recommended_appimage_config)  # noqa: E501
         network.set_recommended_appimage_config()
+        # Speculatively fetch the recommended AppImage, which is the default
+        # choice; it's cancelled below if another binary is chosen.
+        network.download_manager.queue(
+            config.RECOMMENDED_WINE64_APPIMAGE_URL,
+            config.RECOMMENDED_WINE64_APPIMAGE_FULL_FILENAME,
+        )
         if app:
             utils.send_task(app, 'WINE_EXE')
             if config.DIALOG == 'curses':
@@ -161,6 +196,8 @@ def ensure_wine_choice(app=None):
         config.SELECTED_APPIMAGE_FILENAME = str(utils.get_wine_exe_path())
     if not config.WINEBIN_CODE:
         config.WINEBIN_CODE = utils.get_winebin_code_and_desc(utils.get_wine_exe_path())[0]  # noqa: E501
+    if not needs_recommended_appimage():
+        network.download_manager.cancel(config.RECOMMENDED_WINE64_APPIMAGE_URL)  # noqa: E501
 
     logging.debug(f"> {config.SELECTED_APPIMAGE_FILENAME=}")
     logging.debug(f"> {config.RECOMMENDED_WINE64_APPIMAGE_URL=}")
@@ -229,7 +266,7 @@ def ensure_installation_config(app=None):
     logos_icon_url = app_dir / 'img' / f"{config.FLPRODUCTi}-128-icon.png"
     config.LOGOS_ICON_URL = str(logos_icon_url)
     config.LOGOS_ICON_FILENAME = logos_icon_url.name
-    config.LOGOS64_URL = f"https://downloads.logoscdn.com/LBS{config.TARGETVERSION}{config.VERBUM_PATH}Installer/{config.TARGET_RELEASE_VERSION}/{config.FLPRODUCT}-x64.msi"  # noqa: E501
+    config.LOGOS64_URL = get_product_installer_url()
 
     config.LOGOS_VERSION = config.TARGET_RELEASE_VERSION
     config.LOGOS64_MSI = Path(config.LOGOS64_URL).name
@@ -240,6 +277,9 @@ def ensure_installation_config(app=None):
     logging.debug(f"> {config.LOGOS64_MSI=}")
     logging.debug(f"> {config.LOGOS64_URL=}")
 
+    # All choices are known now, so start the downloads.
+    queue_install_downloads()
+
     if app:
         utils.send_task(app, 'INSTALL')
 
@@ -348,7 +388,7 @@ def ensure_wine_executables(app=None):
             downloaded_file = utils.get_downloaded_file_path(appimage_filename)  # noqa: E501
             if not appimage_file.is_file():
                 msg.logos_msg(f"Copying: {downloaded_file} into: {str(appdir_bindir)}")  # noqa: E501
-                shutil.copy(downloaded_file, str(appdir_bindir))
+                utils.place_file(downloaded_file, appdir_bindir)
             os.chmod(appimage_file, 0o755)
             appimage_filename = appimage_file.name
         elif config.WINEBIN_CODE in ["System", "Proton", "PlayOnLinux", "Custom"]:  # noqa: E501
@@ -412,18 +452,14 @@ def ensure_premade_winebottle_download(app=None):
     downloaded_file = utils.get_downloaded_file_path(config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME)  # noqa: E501
     if not downloaded_file:
         downloaded_file = Path(config.MYDOWNLOADS) / config.LOGOS_EXECUTABLE
-    network.logos_reuse_download(
-        config.LOGOS9_WINE64_BOTTLE_TARGZ_URL,
-        config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME,
-        config.MYDOWNLOADS,
-        app=app,
-    )
-    # Install bottle.
-    bottle = Path(f"{config.INSTALLDIR}/data/wine64_bottle")
-    if not bottle.is_dir():
-        utils.install_premade_wine_bottle(
+    # If the bottle isn't installed yet, ensure_wineprefix_init gets it and
+    # unpacks it while it downloads, unless it's downloaded by then.
+    if Path(f"{config.WINEPREFIX}/system.reg").is_file():
+        network.logos_reuse_download(
+            config.LOGOS9_WINE64_BOTTLE_TARGZ_URL,
+            config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME,
             config.MYDOWNLOADS,
-            f"{config.INSTALLDIR}/data"
+            app=app,
         )
 
     logging.debug(f"> '{downloaded_file}' exists?: {Path(downloaded_file).is_file()}")  # noqa: E501
@@ -438,7 +474,7 @@ def ensure_product_installer_download(app=None):
         app=app
     )
 
-    config.LOGOS_EXECUTABLE = f"{config.FLPRODUCT}_v{config.LOGOS_VERSION}-x64.msi"  # noqa: E501
+    config.LOGOS_EXECUTABLE = get_product_installer_name()
     downloaded_file = utils.get_downloaded_file_path(config.LOGOS_EXECUTABLE)
     if not downloaded_file:
         downloaded_file = Path(config.MYDOWNLOADS) / config.LOGOS_EXECUTABLE
@@ -451,7 +487,7 @@ def ensure_product_installer_download(app=None):
     # Copy file into INSTALLDIR.
     installer = Path(f"{config.INSTALLDIR}/data/{config.LOGOS_EXECUTABLE}")
     if not installer.is_file():
-        shutil.copy(downloaded_file, installer.parent)
+        utils.place_file(downloaded_file, installer.parent)
 
     logging.debug(f"> '{downloaded_file}' exists?: {Path(downloaded_file).is_file()}")  # noqa: E501
 
@@ -468,8 +504,8 @@ def ensure_wineprefix_init(app=None):
         logging.debug(f"{init_file} does not exist")
         if config.TARGETVERSION == '9':
             utils.install_premade_wine_bottle(
-                config.MYDOWNLOADS,
                 f"{config.INSTALLDIR}/data",
+                app=app,
             )
         else:
             # if utils.get_wine_exe_path():
@@ -555,6 +591,9 @@ def ensure_icu_data_files(app=None):
 
     icu_license_path = f"{config.WINEPREFIX}/drive_c/windows/globalization/ICU/LICENSE-ICU.txt"  # noqa: E501
     if not utils.file_exists(icu_license_path):
+        if icu_queue_thread is not None:
+            # Make sure a queued download isn't duplicated.
+            icu_queue_thread.join()
         wine.installICUDataFiles(app=app)
     logging.debug('> ICU data files installed')
 
@@ -701,6 +740,55 @@ Categories=Education;
         )
 
 
+def get_product_installer_url():
+    return f"https://downloads.logoscdn.com/LBS{config.TARGETVERSION}{config.VERBUM_PATH}Installer/{config.TARGET_RELEASE_VERSION}/{config.FLPRODUCT}-x64.msi"  # noqa: E501
+
+
+def get_product_installer_name(version=None):
+    if version is None:
+        version = config.LOGOS_VERSION
+    return f"{config.FLPRODUCT}_v{version}-x64.msi"
+
+
+def needs_recommended_appimage():
+    appimage = config.SELECTED_APPIMAGE_FILENAME
+    return (
+        (config.TARGETVERSION == '9' or str(utils.get_wine_exe_path()).lower().endswith('appimage'))  # noqa: E501
+        and appimage is not None
+        and Path(appimage).name == config.RECOMMENDED_WINE64_APPIMAGE_FULL_FILENAME  # noqa: E501
+    )
+
+
+def queue_install_downloads():
+    # Queue every artifact the install will need in the background; each
+    # ensure_* step then only waits for its own file.
+    global icu_queue_thread
+    manager = network.download_manager
+
+    if needs_recommended_appimage():
+        manager.queue(
+            config.RECOMMENDED_WINE64_APPIMAGE_URL,
+            config.RECOMMENDED_WINE64_APPIMAGE_FULL_FILENAME,
+        )
+
+    if config.TARGETVERSION == '9':
+        manager.queue(
+            config.LOGOS9_WINE64_BOTTLE_TARGZ_URL,
+            config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME,
+        )
+
+    manager.queue(config.LOGOS64_URL, get_product_installer_name())
+
+    icu_license_path = f"{config.WINEPREFIX}/drive_c/windows/globalization/ICU/LICENSE-ICU.txt"  # noqa: E501
+    if not utils.file_exists(icu_license_path):
+        # The ICU URL needs a GitHub API request; don't block on it.
+        def queue_icu_download():
+            icu_url = wine.get_icu_data_files_url()
+            if icu_url is not None:
+                manager.queue(icu_url, os.path.basename(icu_url))
+        icu_queue_thread = utils.start_thread(queue_icu_download)
+
+
 def update_install_feedback(text, app=None):
     percent = get_progress_pct(config.INSTALL_STEP, config.INSTALL_STEPS_COUNT)
     logging.debug(f"Install step {config.INSTALL_STEP} of {config.INSTALL_STEPS_COUNT}")  # noqa: E501
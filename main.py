@@ -87,6 +87,10 @@ def get_parser():
         '-P', '--passive', action='store_true',
         help='run product installer non-interactively',
     )
+    cfg.add_argument(
+        '--limit-rate', metavar='RATE',
+        help='limit download speed in bytes per second, e.g. 500K or 2M',
+    )
 
     # Define runtime actions (mutually exclusive).
     grp = parser.add_argument_group(
@@ -180,6 +184,18 @@ def get_parser():
         '--remove-install-dir', action='store_true',
         help='delete the current installation folder',
     )
+    cmd.add_argument(
+        '--gc-artifact-store', action='store_true',
+        help='remove unused files from the shared artifact store',
+    )
+    cmd.add_argument(
+        '--serve-artifacts', action='store_true',
+        help='share verified downloads read-only with DOWNLOAD_PEERS',
+    )
+    cmd.add_argument(
+        '--transfer-stats', action='store_true',
+        help='summarize recorded download metrics per host',
+    )
     cmd.add_argument(
         '--dirlink', action='store_true',
         # help='create directory link',
@@ -235,6 +251,14 @@ def parse_args(args, parser):
     if args.passive:
         config.PASSIVE = True
 
+    if args.limit_rate:
+        try:
+            network.parse_rate(args.limit_rate)
+        except ValueError:
+            message = f"Invalid download rate limit: \"{args.limit_rate}\"\n"  # noqa: E501
+            parser.exit(status=1, message=message)
+        config.DOWNLOAD_RATE_LIMIT = args.limit_rate
+
     # Set ACTION function.
     actions = {
         'install_app': installer.ensure_launcher_shortcuts,
@@ -257,6 +281,9 @@ def parse_args(args, parser):
         'toggle_app_logging': wine.switch_logging,
         'create_shortcuts': installer.ensure_launcher_shortcuts,
         'remove_install_dir': control.remove_install_dir,
+        'gc_artifact_store': network.gc_artifact_store,
+        'serve_artifacts': network.serve_artifacts,
+        'transfer_stats': network.print_transfer_stats,
     }
 
     config.ACTION = None
@@ -428,6 +455,7 @@ def main():
 
 def close():
     logging.debug("Closing Logos on Linux.")
+    network.cancel_deadlines()
     for thread in threads:
         thread.join()
     if len(processes) > 0:
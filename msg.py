@@ -280,7 +280,7 @@ def progress(percent, app=None):
         logos_msg(get_progress_str(percent))  # provisional
 
 
-def status(text, app=None):
+def status(text, app=None, log=True):
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
     """Handles status messages for both TUI and GUI."""
     if app is not None:
@@ -290,7 +290,9 @@ def status(text, app=None):
         elif config.DIALOG == 'curses':
             app.status_q.put(f"{timestamp} {text}")
             app.report_waiting(f"{app.status_q.get()}", dialog=config.use_python_dialog)  # noqa: E501
-        logging.info(f"{text}")
+        if log:
+            # Frequent updates, e.g. of download progress, pass log=False.
+            logging.info(f"{text}")
     else:
         # Prints message to stdout regardless of log level.
         logos_msg(text)
@@ -1,22 +1,87 @@
+import errno
 import hashlib
+import http.client
+import http.server
+import io
 import json
 import logging
 import os
 import queue
+import random
+import re
 import requests
-import shutil
+import stat
 import sys
+import tarfile
 import threading
-from base64 import b64encode
+import time
+import weakref
+import zipfile
+from base64 import b64decode, b64encode
 from datetime import datetime, timedelta
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import quote, unquote, urlparse
 from xml.etree import ElementTree as ET
 
 import config
 import msg
 import utils
 
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024  # don't split transfers below this size
+TRANSFER_BUFFER_SIZE = 256 * 1024
+REMOTE_READ_SIZE = 64 * 1024  # min. bytes per Range request in RemoteFile
+# Response headers kept in the URL metadata cache.
+URL_CACHE_HEADERS = [
+    'Accept-Ranges',
+    'Content-Encoding',
+    'Content-Length',
+    'Content-MD5',
+    'ETag',
+    'Last-Modified',
+    'Server',
+]
+HASH_CHUNK_SIZE = 1024 * 1024
+# Content-defined chunking for delta updates; see get_chunks().
+CHUNK_MARKER = b'\x00\x00'
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 256 * 1024
+HASH_XATTR = 'user.logoslinuxinstaller.digests'
+HTTP_POOL_HOSTS = 10  # number of per-host connection pools to keep
+STALL_TIME = 1.0  # seconds waiting for data that count as a stall
+PROGRESS_SAMPLE_TIME = 0.5  # seconds between throughput samples
+PROGRESS_SMOOTHING = 0.3  # weight of the newest throughput sample
+STORE_GC_GRACE = 60 * 60  # seconds a new artifact store blob is kept
+PEER_TIMEOUT = 2  # seconds to wait for a LAN peer to answer
+RETRY_MAX_DELAY = 60  # seconds
+RATE_LIMIT_RETRIES = 3  # requests retried after waiting out a rate limit
+# Errors that end a transfer early; whether to retry is up to is_retryable().
+TRANSFER_ERRORS = (
+    requests.exceptions.RequestException,
+    http.client.HTTPException,  # e.g. IncompleteRead
+    ConnectionError,
+    TimeoutError,
+)
+url_cache = None  # loaded on first use; {url: {'time': ts, 'headers': {}}}
+url_cache_lock = threading.Lock()
+revalidated_urls = set()  # cached headers checked with the server this run
+hash_cache = None  # loaded on first use; {fingerprint: {'path': , 'md5': }}
+hash_cache_lock = threading.Lock()
+rate_limits = None  # loaded on first use; {host: reset timestamp}
+rate_limits_lock = threading.Lock()
+mirrors = None  # (DOWNLOAD_MIRRORS value, parsed {origin: mirror})
+mirror_misses = set()  # mirror/peer urls that failed; not retried this run
+transfer_log_lock = threading.Lock()
+current_deadline = threading.local()  # Deadline used by this thread
+background = threading.local()  # .active is set in DownloadManager workers
+deadlines = weakref.WeakSet()
+deadlines_lock = threading.Lock()
+stale_responses = {}  # url: time of the cached response used instead
+artifact_index_lock = threading.Lock()
+release_threads = {}  # set_*_config function: thread running it
+release_threads_lock = threading.Lock()
+session = None  # shared requests.Session; see get_session()
+session_lock = threading.Lock()
+
 
 class Props():
     def __init__(self, uri=None):
@@ -45,19 +110,416 @@ class FileProps(Props):
     def get_md5(self):
         if self.path is None:
             return
-        md5 = hashlib.md5()
-        with self.path.open('rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                md5.update(chunk)
-        self.md5 = b64encode(md5.digest()).decode('utf-8')
+        # Skip re-reading the file if it hasn't changed since it was hashed.
+        self.md5 = get_cached_file_digest(self.path, 'md5')
+        if self.md5 is None:
+            md5 = hashlib.md5()
+            with self.path.open('rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    md5.update(chunk)
+            self.md5 = b64encode(md5.digest()).decode('utf-8')
+            set_cached_file_digests(self.path, md5=self.md5)
         logging.debug(f"{str(self.path)} MD5: {self.md5}")
         return self.md5
 
 
+class RateLimiter():
+    # Token bucket shared by all transfers. Tokens are bytes; the bucket
+    # holds at most one second's worth so bursts stay short.
+    def __init__(self, rate=None):
+        self.lock = threading.Lock()
+        self.rate = None
+        self.tokens = 0
+        self.timestamp = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        # rate is in bytes per second; None or 0 means unlimited.
+        with self.lock:
+            if rate == self.rate:
+                return
+            logging.debug(f"Download rate limit set to {rate} B/s.")
+            self.rate = rate
+            self.tokens = 0
+            self.timestamp = time.monotonic()
+
+    def consume(self, amount):
+        with self.lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            refill = (now - self.timestamp) * self.rate
+            self.tokens = min(self.rate, self.tokens + refill)
+            self.timestamp = now
+            # Tokens may go negative; the debt is paid by sleeping, so
+            # concurrent transfers share the rate between them.
+            self.tokens -= amount
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay > 0:
+            time.sleep(delay)
+
+
+rate_limiter = RateLimiter()
+
+
+class DownloadError(Exception):
+    pass
+
+
+def fail_download(message):
+    # A download error that ends the install, except in a background job:
+    # there it's raised for DownloadManager to log, and the install step
+    # that needs the file downloads it itself and reports the error.
+    if getattr(background, 'active', False):
+        raise DownloadError(message)
+    msg.logos_error(message)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    pass
+
+
+class Deadline():
+    # Time budget shared by every request of one logical operation, such as
+    # checking for updates. Requests made inside "with deadline:" get
+    # timeouts no longer than what's left of it (see get_timeout()), and
+    # fail at once when it has run out or was cancelled.
+    def __init__(self, seconds=None, name="Network operation"):
+        self.name = name
+        self.end = None
+        if seconds is not None:
+            self.end = time.monotonic() + float(seconds)
+        self.cancelled = threading.Event()
+        with deadlines_lock:
+            deadlines.add(self)
+
+    def remaining(self):
+        # Seconds left, or None for no limit.
+        if self.cancelled.is_set():
+            return 0
+        if self.end is None:
+            return None
+        return max(0, self.end - time.monotonic())
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise DeadlineExceeded(f"{self.name} was cancelled.")
+        if self.remaining() == 0:
+            raise DeadlineExceeded(f"{self.name} ran out of time.")
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def __enter__(self):
+        self.previous = getattr(current_deadline, 'deadline', None)
+        current_deadline.deadline = self
+        return self
+
+    def __exit__(self, *args):
+        current_deadline.deadline = self.previous
+
+
+def get_deadline():
+    return getattr(current_deadline, 'deadline', None)
+
+
+def get_timeout(timeout=None):
+    # (connect, read) timeouts for a request: timeout, or the configured
+    # defaults, cut to what's left of the current Deadline. The read
+    # timeout is per read, so a stalled transfer fails instead of hanging.
+    if timeout is None:
+        timeout = (
+            float(config.HTTP_CONNECT_TIMEOUT),
+            float(config.HTTP_READ_TIMEOUT),
+        )
+    elif not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    deadline = get_deadline()
+    if deadline is not None:
+        deadline.check()
+        remaining = deadline.remaining()
+        if remaining is not None:
+            timeout = tuple(min(t, remaining) for t in timeout)
+    return timeout
+
+
+def cancel_deadlines():
+    # Make requests of every running operation fail fast, e.g. on exit.
+    with deadlines_lock:
+        for deadline in list(deadlines):
+            deadline.cancel()
+
+
+class TransferStats():
+    # Metrics of one download, appended to the transfer log when it ends,
+    # to tell slow networks from slow disks; see print_transfer_stats().
+    def __init__(self, url, file=None, resumed_from=0, segments=1):
+        self.url = url
+        self.file = file
+        self.resumed_from = resumed_from
+        self.segments = segments
+        self.bytes = 0
+        self.ttfb = None
+        self.stalls = 0
+        self.retries = 0
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def response(self, r):
+        # requests' elapsed is the time until the response headers arrived.
+        with self.lock:
+            if self.ttfb is None:
+                self.ttfb = r.elapsed.total_seconds()
+
+    def add(self, size, wait):
+        with self.lock:
+            self.bytes += size
+            if wait >= STALL_TIME:
+                self.stalls += 1
+
+    def finish(self, result):
+        duration = time.monotonic() - self.start
+        throughput = None
+        if duration > 0:
+            throughput = round(self.bytes / duration)
+        log_transfer_event({
+            'event': 'transfer',
+            'host': urlparse(self.url).netloc,
+            'url': self.url,
+            'file': str(self.file),
+            'result': result,
+            'bytes': self.bytes,
+            'resumed_from': self.resumed_from,
+            'segments': self.segments,
+            'ttfb': self.ttfb,
+            'duration': round(duration, 3),
+            'throughput': throughput,
+            'stalls': self.stalls,
+            'retries': self.retries,
+        })
+
+
+class ProgressMeter():
+    # Bytes received by all transfers, and their moving-average rate; the
+    # network link is shared, so this is what an ETA has to go by.
+    def __init__(self):
+        self.received = 0
+        self.rate = None  # bytes/s
+        self.sample_time = time.monotonic()
+        self.sample_received = 0
+        self.lock = threading.Lock()
+
+    def add(self, size):
+        with self.lock:
+            self.received += size
+
+    def get_rate(self):
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.sample_time
+            if elapsed >= PROGRESS_SAMPLE_TIME:
+                rate = (self.received - self.sample_received) / elapsed
+                if self.rate is None:
+                    self.rate = rate
+                else:
+                    # Exponentially weighted, to smooth out bursts.
+                    self.rate += PROGRESS_SMOOTHING * (rate - self.rate)
+                self.sample_time = now
+                self.sample_received = self.received
+            return self.rate
+
+
+progress_meter = ProgressMeter()
+
+
+def get_progress_detail(done, total, rate):
+    # e.g. "312.0 of 690.5 MiB, 12.3 MiB/s, 0:31 left"
+    mib = 1024 * 1024
+    parts = []
+    if total:
+        parts.append(f"{done / mib:.1f} of {total / mib:.1f} MiB")
+    if rate is not None:
+        parts.append(f"{rate / mib:.1f} MiB/s")
+        if total and rate > 0:
+            eta = timedelta(seconds=round((total - done) / rate))
+            parts.append(f"{eta} left")
+    return ', '.join(parts)
+
+
+class DownloadJob():
+    def __init__(self, url, file):
+        self.url = url
+        self.file = file
+        self.size = None
+        self.percent = 0
+        self.result = None  # verified file path once finished
+        self.done = threading.Event()
+        self.cancelled = threading.Event()
+
+    def put(self, percent):
+        # Lets the job stand in for net_get's progress queue.
+        self.percent = percent
+
+
+class DownloadManager():
+    # Downloads queued artifacts in background worker threads. Install
+    # steps call wait() for the artifact they need, so transfers overlap
+    # with each other and with the steps that come before.
+    def __init__(self):
+        self.jobs = {}  # url: DownloadJob
+        self.lock = threading.Lock()
+        self.todo = queue.Queue()
+        self.workers = []
+
+    def queue(self, url, file):
+        if url is None or file is None:
+            return None
+        with self.lock:
+            job = self.jobs.get(url)
+        if job is not None and job.cancelled.is_set():
+            # Don't let a new job write the file before the old one stops.
+            job.done.wait()
+        with self.lock:
+            job = self.jobs.get(url)
+            if job is None or job.cancelled.is_set():
+                logging.info(f"Queueing download of {file}.")
+                job = DownloadJob(url, file)
+                self.jobs[url] = job
+                self.todo.put(job)
+                self.start_workers()
+                # Size every job right away, not when a worker gets to it,
+                # so that the total to download is known up front.
+                threading.Thread(
+                    target=self.get_size,
+                    args=[job],
+                    daemon=True,
+                ).start()
+        return job
+
+    def get_size(self, job):
+        try:
+            size = UrlProps(job.url, file=job.file).size
+        except Exception as e:
+            logging.debug(f"Couldn't get size of {job.file}: {e}")
+            return
+        if job.size is None:
+            job.size = size
+
+    def start_workers(self):
+        self.workers = [w for w in self.workers if w.is_alive()]
+        while len(self.workers) < int(config.DOWNLOAD_WORKERS):
+            w = threading.Thread(target=self.work, daemon=True)
+            self.workers.append(w)
+            w.start()
+
+    def work(self):
+        background.active = True
+        while True:
+            job = self.todo.get()
+            if job.cancelled.is_set():
+                job.done.set()
+                continue
+            try:
+                if job.size is None:
+                    job.size = UrlProps(job.url, file=job.file).size
+                job.result = download_artifact(
+                    job.url,
+                    job.file,
+                    q=job,
+                    cancel_evt=job.cancelled,
+                )
+            except Exception as e:
+                logging.error(f"Background download of {job.file} failed: {e}")  # noqa: E501
+            finally:
+                job.done.set()
+
+    def cancel(self, url):
+        # Stop a queued or running download. A partial file is left in
+        # place, so a later download of the same url resumes it.
+        with self.lock:
+            job = self.jobs.get(url)
+            if job is None or job.done.is_set():
+                return
+            logging.info(f"Cancelling download of {job.file}.")
+            job.cancelled.set()
+
+    def cancel_all(self):
+        with self.lock:
+            urls = list(self.jobs.keys())
+        for url in urls:
+            self.cancel(url)
+
+    def get_progress(self):
+        # Return (percent, bytes done, bytes total) of all queued jobs; the
+        # percentage is weighted by size where known. A job that found its
+        # file without downloading it counts as complete.
+        with self.lock:
+            jobs = [j for j in self.jobs.values() if not j.cancelled.is_set()]
+        if not jobs:
+            return 100, 0, 0
+
+        def get_job_percent(job):
+            if job.done.is_set() and job.result is not None:
+                return 100
+            return job.percent
+
+        total = sum(j.size or 0 for j in jobs)
+        done = sum((j.size or 0) * get_job_percent(j) / 100 for j in jobs)
+        if not total:
+            percent = sum(get_job_percent(j) for j in jobs) / len(jobs)
+        else:
+            percent = done / total * 100
+        return round(percent), round(done), total
+
+    def get_percent(self):
+        return self.get_progress()[0]
+
+    def wait(self, url, app=None):
+        # Return the verified file path for a queued url, or None if it
+        # wasn't queued or the download failed.
+        with self.lock:
+            job = self.jobs.get(url)
+        if job is None:
+            return None
+        if job.cancelled.is_set():
+            # Let a cancelled job stop before the caller touches the file.
+            job.done.wait()
+            return None
+        if not job.done.is_set():
+            msg.status(f"Waiting for download of {job.file}…", app)
+            if config.DIALOG == 'tk' and app:
+                app.stop_indeterminate_progress()
+        waited = False
+        while not job.done.wait(timeout=0.5):
+            waited = True
+            # Show the progress of all queued downloads, which is what the
+            # install is waiting for, not just of this one.
+            percent, done, total = self.get_progress()
+            detail = get_progress_detail(done, total, progress_meter.get_rate())  # noqa: E501
+            if config.DIALOG == 'tk' and app:
+                send_progress(percent, app=app)
+                msg.status(f"Downloading {job.file}… {detail}", app, log=False)  # noqa: E501
+            else:
+                utils.write_progress_bar(percent, detail=detail, app=app)
+        if waited and config.DIALOG not in ['tk', 'curses']:
+            print()
+        if job.result is None:
+            # Let the caller download it again in the foreground.
+            with self.lock:
+                self.jobs.pop(url, None)
+        return job.result
+
+
+download_manager = DownloadManager()
+
+
 class UrlProps(Props):
-    def __init__(self, url=None):
+    def __init__(self, url=None, file=None):
         super().__init__(url)
         self.headers = None
+        self.origin = url  # self.path is changed if a mirror serves the url
+        self.file = file  # local file name, to look for on DOWNLOAD_PEERS
+        self.failed = set()  # sources that failed since the last full round
         if url is not None:
             self.get_headers()
             self.get_size()
@@ -66,10 +528,28 @@ class UrlProps(Props):
     def get_headers(self):
         if self.path is None:
             self.headers = None
-        logging.debug(f"Getting headers from {self.path}.")
+        # Alternative sources are tried in order; the origin is the fallback.
+        alternates = get_download_sources(self.origin, self.file)[:-1]
+        for source in [s for s in alternates if s not in self.failed]:
+            peer = is_peer_url(source)
+            try:
+                timeout = PEER_TIMEOUT if peer else None
+                headers, ok = self.request_headers(source, timeout=timeout)
+                if ok and peer:
+                    ok = self.matches_origin(headers)
+            except requests.exceptions.RequestException as e:
+                logging.warning(f"Request to {source} failed: {e}")
+                ok = False
+            if ok:
+                logging.debug(f"Using {source} for {self.origin}.")
+                self.path = source
+                self.headers = headers
+                return self.headers
+            logging.info(f"{source} not available; trying the next source.")
+            mirror_misses.add(source)
+        self.path = self.origin
         try:
-            h = {'Accept-Encoding': 'identity'}  # force non-compressed txfr
-            r = requests.head(self.path, allow_redirects=True, headers=h)
+            self.headers, ok = self.request_headers(self.path)
         except requests.exceptions.ConnectionError:
             logging.critical("Failed to connect to the server.")
             return None
@@ -80,9 +560,70 @@ class UrlProps(Props):
             print()
             msg.logos_error("Interrupted by Ctrl+C")
             return None
-        self.headers = r.headers
         return self.headers
 
+    def failover(self):
+        # Called when a download from self.path failed: switch to the next
+        # source that hasn't failed yet, or start over from the first once
+        # all of them have. Returns True if an untried source is used.
+        failed_path = self.path
+        self.failed.add(failed_path)
+        # Don't trust cached headers of the source that failed.
+        forget_cached_url_headers(failed_path)
+        sources = get_download_sources(self.origin, self.file)
+        wrapped = all(s in self.failed for s in sources)
+        if wrapped:
+            self.failed.clear()
+        self.headers = None
+        self.size = None
+        self.md5 = None
+        if self.get_headers() is not None:
+            self.get_size()
+            self.get_md5()
+        if self.path != failed_path and not wrapped:
+            logging.info(f"Failing over from {failed_path} to {self.path}.")
+            return True
+        return False
+
+    def request_headers(self, url, timeout=None):
+        # Return (headers, ok) for url; only good responses are cached.
+        cached_headers = get_cached_url_headers(url)
+        if cached_headers is not None:
+            logging.debug(f"Using cached headers for {url}.")
+            return cached_headers, True
+        logging.debug(f"Getting headers from {url}.")
+        h = {'Accept-Encoding': 'identity'}  # force non-compressed txfr
+        r = get_session().head(
+            url,
+            allow_redirects=True,
+            headers=h,
+            timeout=get_timeout(timeout),
+        )
+        if r.ok:
+            set_cached_url_headers(url, r.headers)
+        return r.headers, r.ok
+
+    def matches_origin(self, headers):
+        # A peer only knows the file by name and isn't authenticated; use
+        # its copy only if it has the size and MD5 the origin reports. If
+        # the origin can't be reached or gives no MD5, there's nothing to
+        # check the peer's bytes against, so it isn't used.
+        try:
+            origin_headers, ok = self.request_headers(self.origin)
+        except requests.exceptions.RequestException as e:
+            logging.info(f"Can't check peer copy of {self.file}: {e}")
+            return False
+        origin_md5 = get_headers_md5(origin_headers) if ok else None
+        if origin_md5 is None:
+            logging.info(f"Can't check peer copy of {self.file}: {self.origin} gives no MD5.")  # noqa: E501
+            return False
+        size = headers.get('Content-Length')
+        origin_size = origin_headers.get('Content-Length')
+        if size != origin_size or get_headers_md5(headers) != origin_md5:
+            logging.info(f"Peer copy of {self.file} doesn't match {self.origin}.")  # noqa: E501
+            return False
+        return True
+
     def get_size(self):
         if self.headers is None:
             r = self.get_headers()
@@ -102,22 +643,849 @@ class UrlProps(Props):
             r = self.get_headers()
             if r is None:
                 return
-        if self.headers.get('server') == 'AmazonS3':
-            content_md5 = self.headers.get('etag')
-            if content_md5 is not None:
-                # Convert from hex to base64
-                content_md5_hex = content_md5.strip('"').strip("'")
-                content_md5 = b64encode(bytes.fromhex(content_md5_hex)).decode()  # noqa: E501
-        else:
-            content_md5 = self.headers.get('Content-MD5')
-        if content_md5 is not None:
-            content_md5 = content_md5.strip('"').strip("'")
+        content_md5 = get_headers_md5(self.headers)
         logging.debug(f"{content_md5=}")
         if content_md5 is not None:
             self.md5 = content_md5
         return self.md5
 
 
+def get_headers_md5(headers):
+    # Return the MD5 the server gives for a file, base64-encoded, or None.
+    if headers.get('server') == 'AmazonS3':
+        content_md5 = headers.get('etag')
+        if content_md5 is not None:
+            # Convert from hex to base64
+            content_md5_hex = content_md5.strip('"').strip("'")
+            content_md5 = b64encode(bytes.fromhex(content_md5_hex)).decode()  # noqa: E501
+    else:
+        content_md5 = headers.get('Content-MD5')
+    if content_md5 is not None:
+        content_md5 = content_md5.strip('"').strip("'")
+    return content_md5
+
+
+def get_transfer_log_path():
+    # JSON lines, next to the installer log.
+    return Path(config.LOGOS_LOG).with_suffix('.transfers.jsonl')
+
+
+def log_transfer_event(event):
+    event['time'] = datetime.now().isoformat(timespec='seconds')
+    log_path = get_transfer_log_path()
+    with transfer_log_lock:
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with log_path.open('a') as f:
+                f.write(f"{json.dumps(event)}\n")
+        except OSError as e:
+            logging.debug(f"Failed to write {log_path}: {e}")
+
+
+def get_percentile(values, percent):
+    # Nearest-rank percentile of a non-empty list.
+    values = sorted(values)
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+def print_transfer_stats():
+    log_path = get_transfer_log_path()
+    events = []
+    try:
+        with log_path.open() as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        print(f"No transfers recorded in {log_path}.")
+        return
+    transfers = [e for e in events if e.get('event') == 'transfer']
+    verifies = [e for e in events if e.get('event') == 'verify']
+    print(f"Transfers recorded in {log_path}:")
+    print(f"{'host':<36} {'n':>4} {'MiB':>9} {'p50 MiB/s':>10} {'p95 MiB/s':>10} {'p50 ttfb':>9} {'stalls':>7} {'retries':>7} {'failed':>7}")  # noqa: E501
+    hosts = sorted(set(e.get('host') for e in transfers))
+    for host in hosts:
+        host_transfers = [e for e in transfers if e.get('host') == host]
+        rates = [e.get('throughput') / 1024 ** 2 for e in host_transfers if e.get('throughput') and e.get('bytes')]  # noqa: E501
+        ttfbs = [e.get('ttfb') for e in host_transfers if e.get('ttfb') is not None]  # noqa: E501
+        size = sum(e.get('bytes', 0) for e in host_transfers) / 1024 ** 2
+        stalls = sum(e.get('stalls', 0) for e in host_transfers)
+        retries = sum(e.get('retries', 0) for e in host_transfers)
+        failed = len([e for e in host_transfers if e.get('result') != 'ok'])
+        p50 = f"{get_percentile(rates, 50):.2f}" if rates else '-'
+        p95 = f"{get_percentile(rates, 95):.2f}" if rates else '-'
+        ttfb = f"{get_percentile(ttfbs, 50):.3f}s" if ttfbs else '-'
+        print(f"{host:<36} {len(host_transfers):>4} {size:>9.1f} {p50:>10} {p95:>10} {ttfb:>9} {stalls:>7} {retries:>7} {failed:>7}")  # noqa: E501
+    if verifies:
+        times = [e.get('seconds') for e in verifies]
+        print(f"Verifications: {len(verifies)}; p50 {get_percentile(times, 50):.3f}s; p95 {get_percentile(times, 95):.3f}s")  # noqa: E501
+
+
+def parse_rate(rate):
+    # Convert e.g. 500K or 2M (bytes per second) to an int; 0 = unlimited.
+    if rate is None or rate == '':
+        return 0
+    if isinstance(rate, (int, float)):
+        return int(rate)
+    multipliers = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    rate = str(rate).strip().upper().removesuffix('B')
+    multiplier = multipliers.get(rate[-1:], 1)
+    if rate[-1:] in multipliers:
+        rate = rate[:-1]
+    return int(float(rate) * multiplier)
+
+
+def get_rate_limit():
+    try:
+        return parse_rate(config.DOWNLOAD_RATE_LIMIT)
+    except ValueError:
+        logging.error(f"Invalid download rate limit: {config.DOWNLOAD_RATE_LIMIT}")  # noqa: E501
+        return 0
+
+
+def set_rate_limit(rate):
+    # Can be called while transfers are running.
+    config.DOWNLOAD_RATE_LIMIT = rate
+    rate_limiter.set_rate(parse_rate(rate))
+
+
+def get_mirrors():
+    # DOWNLOAD_MIRRORS maps upstream url prefixes to mirror prefixes, either
+    # as a dict (JSON config) or as "ORIGIN=MIRROR[,ORIGIN=MIRROR…]" (env).
+    global mirrors
+    value = config.DOWNLOAD_MIRRORS
+    if mirrors is not None and mirrors[0] == value:
+        return mirrors[1]
+    parsed = value or {}
+    if isinstance(parsed, str):
+        pairs = [p.split('=', 1) for p in parsed.replace(',', ' ').split()]
+        bad = [p[0] for p in pairs if len(p) != 2]
+        if bad:
+            logging.error(f"Ignoring invalid download mirror entries: {bad}")
+        parsed = {p[0]: p[1] for p in pairs if len(p) == 2}
+    parsed = {o.rstrip('/'): m.rstrip('/') for o, m in parsed.items()}
+    mirrors = (value, parsed)
+    return parsed
+
+
+def get_mirror_url(url):
+    # Rewrite url to its mirror location, or return None if no mirror
+    # covers it. The longest matching origin prefix wins.
+    if url is None:
+        return None
+    mirrors = get_mirrors()
+    for origin in sorted(mirrors, key=len, reverse=True):
+        if url == origin or url.startswith(f"{origin}/"):
+            return f"{mirrors.get(origin)}{url[len(origin):]}"
+    return None
+
+
+def get_peers():
+    # DOWNLOAD_PEERS lists other machines running --serve-artifacts, either
+    # as a list (JSON config) or as "URL[,URL…]" (env).
+    peers = config.DOWNLOAD_PEERS or []
+    if isinstance(peers, str):
+        peers = peers.replace(',', ' ').split()
+    return [p.rstrip('/') for p in peers]
+
+
+def is_peer_url(url):
+    return any(url.startswith(f"{p}/") for p in get_peers())
+
+
+def get_download_sources(url, file=None):
+    # Ordered places to download url from: LAN peers that may have file,
+    # then the mirror; the origin always comes last.
+    sources = []
+    if file is not None:
+        sources.extend(f"{p}/{quote(file)}" for p in get_peers())
+    mirror_url = get_mirror_url(url)
+    if mirror_url is not None and mirror_url not in mirror_misses:
+        sources.append(mirror_url)
+    sources.append(url)
+    return sources
+
+
+def get_session():
+    # One kept-alive session lets repeated requests to the same host skip
+    # the TCP and TLS handshakes.
+    global session
+    with session_lock:
+        if session is None:
+            pool_size = max(
+                int(config.HTTP_POOL_SIZE),
+                int(config.DOWNLOAD_SEGMENTS)
+            )
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_HOSTS,
+                pool_maxsize=pool_size,
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = (
+                f"LogosLinuxInstaller/{config.LLI_CURRENT_VERSION} "
+                f"{requests.utils.default_user_agent()}"
+            )
+    return session
+
+
+def read_json_file(file_path):
+    file_path = Path(file_path)
+    try:
+        with file_path.open() as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logging.debug(f"Ignoring unreadable file {file_path}: {e}")
+        return None
+
+
+def write_json_file(file_path, data):
+    # Write to a temp file and rename so readers never see a partial file.
+    # The temp file's name is unique, so that concurrent writers, which may
+    # be other processes, don't write into each other's.
+    # (Not mkstemp, whose files are private to the user; the artifact
+    # store may be shared.)
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")  # noqa: E501
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with temp_path.open('w') as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+        os.replace(temp_path, file_path)
+    except OSError as e:
+        logging.debug(f"Failed to write {file_path}: {e}")
+        temp_path.unlink(missing_ok=True)
+
+
+def get_url_cache():
+    global url_cache
+    if url_cache is None:
+        url_cache = {}
+        if config.URL_CACHE_FILE:
+            url_cache = read_json_file(config.URL_CACHE_FILE) or {}
+    return url_cache
+
+
+def write_url_cache():
+    if config.URL_CACHE_FILE:
+        write_json_file(config.URL_CACHE_FILE, url_cache)
+
+
+def get_cached_url_headers(url):
+    ttl = int(config.URL_CACHE_TTL)
+    if ttl <= 0:
+        return None
+    with url_cache_lock:
+        entry = get_url_cache().get(url)
+    if entry is None or time.time() - entry.get('time', 0) > ttl:
+        return None
+    return requests.structures.CaseInsensitiveDict(entry.get('headers'))
+
+
+def set_cached_url_headers(url, headers):
+    if int(config.URL_CACHE_TTL) <= 0:
+        return
+    entry = {
+        'time': time.time(),
+        'headers': {
+            k: headers.get(k) for k in URL_CACHE_HEADERS
+            if headers.get(k) is not None
+        },
+    }
+    with url_cache_lock:
+        cache = get_url_cache()
+        cache[url] = entry
+        # Drop expired entries so the cache file doesn't grow forever.
+        ttl = int(config.URL_CACHE_TTL)
+        for k in [k for k, v in cache.items() if time.time() - v.get('time', 0) > ttl]:  # noqa: E501
+            del cache[k]
+        write_url_cache()
+
+
+def revalidate_cached_url_headers(url):
+    # Cached headers may be up to URL_CACHE_TTL old. Before they decide
+    # whether a file is verified, check with a conditional HEAD that they
+    # still describe what the server has; once per url per run.
+    with url_cache_lock:
+        if url in revalidated_urls:
+            return
+        revalidated_urls.add(url)
+    headers = get_cached_url_headers(url)
+    if headers is None:
+        return
+    h = {'Accept-Encoding': 'identity'}
+    if headers.get('ETag') is not None:
+        h['If-None-Match'] = headers.get('ETag')
+    elif headers.get('Last-Modified') is not None:
+        h['If-Modified-Since'] = headers.get('Last-Modified')
+    else:
+        forget_cached_url_headers(url)
+        return
+    try:
+        r = get_session().head(
+            url,
+            allow_redirects=True,
+            headers=h,
+            timeout=get_timeout(),
+        )
+    except requests.exceptions.RequestException as e:
+        # Offline; the cached headers are the best there is.
+        logging.debug(f"Couldn't revalidate cached headers for {url}: {e}")
+        return
+    if r.status_code == 304:
+        logging.debug(f"Cached headers for {url} are current.")
+    elif r.ok:
+        logging.info(f"{url} has changed since its headers were cached.")
+        set_cached_url_headers(url, r.headers)
+    else:
+        forget_cached_url_headers(url)
+
+
+def forget_cached_url_headers(url):
+    urls = [u for u in [url, get_mirror_url(url)] if u is not None]
+    with url_cache_lock:
+        removed = [u for u in urls if get_url_cache().pop(u, None) is not None]  # noqa: E501
+        for u in removed:
+            logging.debug(f"Removed cached headers for {u}.")
+        if removed:
+            write_url_cache()
+
+
+def get_response_cache_path(url):
+    name = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return Path(config.RESPONSE_CACHE_DIR) / f"{name}.json"
+
+
+def get_cached_response(url):
+    # {'url': , 'source': , 'etag': , 'last_modified': , 'body': } or None
+    if not config.RESPONSE_CACHE_DIR:
+        return None
+    entry = read_json_file(get_response_cache_path(url))
+    if entry is None or entry.get('url') != url:
+        return None
+    return entry
+
+
+def set_cached_response(url, source, r):
+    if not config.RESPONSE_CACHE_DIR:
+        return
+    entry = {
+        'url': url,
+        'source': source,  # the mirror or origin url that sent the body
+        'time': time.time(),
+        'etag': r.headers.get('ETag'),
+        'last_modified': r.headers.get('Last-Modified'),
+        'body': r.content.decode('utf-8', errors='replace'),
+    }
+    write_json_file(get_response_cache_path(url), entry)
+
+
+def get_rate_limits():
+    global rate_limits
+    if rate_limits is None:
+        rate_limits = {}
+        if config.RESPONSE_CACHE_DIR:
+            path = Path(config.RESPONSE_CACHE_DIR) / "rate_limits.json"
+            rate_limits = read_json_file(path) or {}
+    return rate_limits
+
+
+def get_rate_limited_until(host):
+    with rate_limits_lock:
+        return get_rate_limits().get(host, 0)
+
+
+def set_rate_limited_until(host, reset):
+    # Persisted, so that the next run doesn't spend a request finding out.
+    with rate_limits_lock:
+        limits = get_rate_limits()
+        limits[host] = reset
+        for h in [h for h, t in limits.items() if t < time.time()]:
+            del limits[h]
+        if config.RESPONSE_CACHE_DIR:
+            path = Path(config.RESPONSE_CACHE_DIR) / "rate_limits.json"
+            write_json_file(path, limits)
+
+
+def get_rate_limit_reset(r):
+    # Return the time a rate-limited response says to retry at, or None if
+    # the response wasn't rate-limited. GitHub uses Retry-After for its
+    # secondary limits and X-RateLimit-* for the hourly quota.
+    if r.status_code not in [403, 429]:
+        return None
+    retry_after = r.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return time.time() + int(retry_after)
+    reset = r.headers.get('X-RateLimit-Reset', '')
+    if r.headers.get('X-RateLimit-Remaining') == '0' and reset.isdigit():
+        return int(reset)
+    return None
+
+
+def net_get_cached(url):
+    # Return the body of url as bytes, like net_get(url), but keep it on
+    # disk and revalidate it with If-None-Match/If-Modified-Since. A 304
+    # costs no bandwidth and, on GitHub, no API quota. The cached body is
+    # also used when the server can't be reached or is rate-limiting us.
+    entry = get_cached_response(url)
+    stale = entry.get('body').encode() if entry else None
+
+    def request(source):
+        headers = {}
+        if entry is not None and entry.get('source') == source:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry.get('etag')
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry.get('last_modified')
+        logging.debug(f"Requesting {source} with {headers=}.")
+        return get_session().get(
+            source,
+            headers=headers,
+            timeout=get_timeout(),
+        )
+
+    def use(r, source):
+        stale_responses.pop(url, None)
+        if r.status_code == 304:
+            logging.debug(f"{url} not modified; using cached response.")
+            return stale
+        set_cached_response(url, source, r)
+        return r.content
+
+    def use_stale():
+        # Remember that the caller got an old copy, so the UI can say so.
+        if stale is not None:
+            logging.warning(f"Using cached response for {url}.")
+            stale_responses[url] = entry.get('time')
+        return stale
+
+    mirror_url = get_mirror_url(url)
+    if mirror_url is not None and mirror_url not in mirror_misses:
+        try:
+            r = request(mirror_url)
+            if r.ok or r.status_code == 304:
+                return use(r, mirror_url)
+        except DeadlineExceeded as e:
+            logging.warning(e)
+            return use_stale()
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Mirror request failed: {e}")
+        logging.info(f"{mirror_url} not on mirror; using {url}.")
+        mirror_misses.add(mirror_url)
+
+    host = urlparse(url).netloc
+    waited = 0
+    retries = 0
+    while True:
+        wait = get_rate_limited_until(host) - time.time()
+        if wait > 0:
+            if stale is not None:
+                logging.warning(f"{host} rate limit reached.")
+                return use_stale()
+            deadline = get_deadline()
+            if deadline is not None and deadline.remaining() is not None:
+                if wait > deadline.remaining():
+                    logging.error(f"{host} rate limit reached; {deadline.name} can't wait for it.")  # noqa: E501
+                    return None
+            # Limit the total wait too: a server that keeps answering with
+            # Retry-After: 0 or a past reset time would otherwise be asked
+            # again every second, forever.
+            if (
+                waited + wait > int(config.RATE_LIMIT_MAX_WAIT)
+                or retries >= RATE_LIMIT_RETRIES
+            ):
+                reset = datetime.fromtimestamp(time.time() + wait)
+                logging.error(f"{host} rate limit reached. Please try again after {reset:%H:%M:%S}.")  # noqa: E501
+                return None
+            logging.warning(f"{host} rate limit reached; retrying in {round(wait)} s.")  # noqa: E501
+            time.sleep(wait)
+            waited += wait
+            retries += 1
+        try:
+            r = request(url)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error occurred during HTTP request: {e}")
+            return use_stale()
+        reset = get_rate_limit_reset(r)
+        if reset is not None:
+            # Never busy-loop on a reset time that has already passed.
+            set_rate_limited_until(host, max(reset, time.time() + 1))
+            continue
+        if r.ok or r.status_code == 304:
+            return use(r, url)
+        logging.error(f"HTTP error occurred: {r.status_code}")
+        return use_stale()
+
+
+def get_stale_response_time(url):
+    # When the last net_get_cached(url) fell back to a cached copy, return
+    # the time that copy was fetched; otherwise None.
+    return stale_responses.get(url)
+
+
+def get_file_fingerprint(file_path):
+    st = os.stat(file_path)
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def get_hash_cache():
+    global hash_cache
+    if hash_cache is None:
+        hash_cache = {}
+        if config.HASH_CACHE_FILE:
+            hash_cache = read_json_file(config.HASH_CACHE_FILE) or {}
+    return hash_cache
+
+
+def write_hash_cache():
+    if not config.HASH_CACHE_FILE:
+        return
+    # Drop entries for files that have since changed or been removed.
+    for fingerprint, entry in list(hash_cache.items()):
+        try:
+            current = get_file_fingerprint(entry.get('path'))
+        except (OSError, TypeError):
+            current = None
+        if current != fingerprint:
+            del hash_cache[fingerprint]
+    write_json_file(config.HASH_CACHE_FILE, hash_cache)
+
+
+def get_file_digests_xattr(file_path):
+    try:
+        return json.loads(os.getxattr(file_path, HASH_XATTR))
+    except (AttributeError, OSError, ValueError):
+        # No xattr support on this platform/filesystem, or none set.
+        return None
+
+
+def get_cached_file_digest(file_path, algorithm):
+    try:
+        fingerprint = get_file_fingerprint(file_path)
+    except OSError:
+        return None
+    entry = get_file_digests_xattr(file_path)
+    if entry is None or entry.get('fingerprint') != fingerprint:
+        with hash_cache_lock:
+            entry = get_hash_cache().get(fingerprint)
+    if entry is None:
+        return None
+    digest = entry.get(algorithm)
+    if digest is not None:
+        logging.debug(f"Using cached {algorithm} digest for {file_path}.")
+    return digest
+
+
+def set_cached_file_digests(file_path, **digests):
+    try:
+        fingerprint = get_file_fingerprint(file_path)
+    except OSError:
+        return
+    entry = get_file_digests_xattr(file_path)
+    if entry is None or entry.get('fingerprint') != fingerprint:
+        entry = {'fingerprint': fingerprint}
+    entry.update(digests)
+    try:
+        os.setxattr(file_path, HASH_XATTR, json.dumps(entry).encode())
+        return
+    except (AttributeError, OSError) as e:
+        logging.debug(f"Can't store digests as xattr on {file_path}: {e}")
+    entry['path'] = str(Path(file_path).resolve())
+    del entry['fingerprint']
+    with hash_cache_lock:
+        cache = get_hash_cache()
+        cache.setdefault(fingerprint, {}).update(entry)
+        write_hash_cache()
+
+
+def get_artifact_store():
+    # Optional content-addressed store of downloaded artifacts, shared by
+    # every install (and user, if ARTIFACT_STORE is a directory they can
+    # all write to). Returns None if it's not enabled.
+    if not config.ARTIFACT_STORE:
+        return None
+    return Path(config.ARTIFACT_STORE).expanduser()
+
+
+def get_store_blob_path(store, sha256):
+    return store / 'sha256' / sha256[:2] / sha256
+
+
+def get_store_refs_path(blob):
+    return blob.with_name(f"{blob.name}.refs")
+
+
+def get_store_url_path(store, url):
+    # Which blob a url last resolved to, one file per url so that several
+    # processes can update the store at once.
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return store / 'urls' / f"{key}.json"
+
+
+def get_file_sha256(file_path):
+    sha256 = get_cached_file_digest(file_path, 'sha256')
+    if sha256 is None:
+        hashers = get_hashers()
+        hash_file(file_path, hashers)
+        digests = get_hasher_digests(hashers)
+        set_cached_file_digests(file_path, **digests)
+        sha256 = digests.get('sha256')
+    return sha256
+
+
+def add_store_refs(blob, *paths):
+    # Record where copies of a blob were placed; see gc_artifact_store().
+    refs_path = get_store_refs_path(blob)
+    refs = read_json_file(refs_path) or []
+    new_refs = [str(Path(p).resolve()) for p in paths]
+    new_refs = [r for r in new_refs if r not in refs]
+    if new_refs:
+        write_json_file(refs_path, refs + new_refs)
+
+
+def store_artifact(url, file_path, *refs):
+    # Add a verified download to the artifact store and record file_path
+    # and refs, other places holding the same bytes, as its users.
+    store = get_artifact_store()
+    if store is None:
+        return
+    try:
+        sha256 = get_file_sha256(file_path)
+        blob = get_store_blob_path(store, sha256)
+        if not blob.is_file():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            utils.place_file(file_path, blob)
+            logging.info(f"Added {file_path} to the artifact store.")
+        add_store_refs(blob, file_path, *refs)
+        props = UrlProps(url)
+        write_json_file(get_store_url_path(store, url), {
+            'url': url,
+            'sha256': sha256,
+            'size': Path(file_path).stat().st_size,
+            'validator': get_validator(props.headers or {}),
+        })
+    except OSError as e:
+        logging.warning(f"Couldn't add {file_path} to the artifact store: {e}")  # noqa: E501
+
+
+def find_stored_artifact(url, file_path, app=None):
+    # If the store holds url's current content, place it at file_path
+    # (a reflink or hardlink where possible) and return file_path.
+    store = get_artifact_store()
+    if store is None:
+        return None
+    entry = read_json_file(get_store_url_path(store, url))
+    if entry is None:
+        return None
+    blob = get_store_blob_path(store, entry.get('sha256'))
+    if not blob.is_file():
+        return None
+    props = UrlProps(url)
+    if props.headers is not None:
+        validator = get_validator(props.headers)
+        if validator is not None and validator != entry.get('validator'):
+            logging.info(f"{url} has changed since it was stored.")
+            return None
+    if not verify_downloaded_file(url, blob, app=app):
+        return None
+    try:
+        utils.place_file(blob, file_path)
+        add_store_refs(blob, file_path)
+        add_served_artifact(url, file_path)
+    except OSError as e:
+        logging.warning(f"Couldn't use {blob} from the artifact store: {e}")
+        return None
+    logging.info(f"Using {Path(file_path).name} from the artifact store.")
+    return file_path
+
+
+def gc_artifact_store():
+    # Remove blobs that nothing uses any more: no hardlinks besides the
+    # blob itself, and no recorded copy still in place.
+    store = get_artifact_store()
+    if store is None:
+        msg.logos_msg("The artifact store is not enabled; set ARTIFACT_STORE.")  # noqa: E501
+        return
+    removed = 0
+    freed = 0
+    for blob in sorted((store / 'sha256').glob('*/*')):
+        if blob.suffix:
+            continue  # .refs, .tmp
+        st = blob.stat()
+        if time.time() - st.st_ctime < STORE_GC_GRACE:
+            # It may have just been added and not linked yet.
+            continue
+        refs_path = get_store_refs_path(blob)
+        refs = read_json_file(refs_path) or []
+        live = [
+            r for r in refs
+            if Path(r).is_file() and Path(r).stat().st_size == st.st_size
+        ]
+        if st.st_nlink > 1 or live:
+            if live != refs:
+                write_json_file(refs_path, live)
+            continue
+        logging.info(f"Removing unreferenced artifact {blob.name}.")
+        blob.unlink()
+        refs_path.unlink(missing_ok=True)
+        removed += 1
+        freed += st.st_size
+    for url_path in (store / 'urls').glob('*.json'):
+        entry = read_json_file(url_path) or {}
+        sha256 = entry.get('sha256')
+        if sha256 is None or not get_store_blob_path(store, sha256).is_file():
+            url_path.unlink(missing_ok=True)
+    msg.logos_msg(f"Removed {removed} unreferenced artifacts; freed {freed / 1024 ** 2:.1f} MiB.")  # noqa: E501
+
+
+def add_served_artifact(url, file_path):
+    # Record a verified download in MYDOWNLOADS, with the MD5 its source
+    # gave, as one that --serve-artifacts may share. Nothing else there
+    # is shared: MYDOWNLOADS is usually the user's own Downloads folder.
+    if not config.ARTIFACT_INDEX_FILE or config.MYDOWNLOADS is None:
+        return
+    file_path = Path(file_path)
+    if file_path.parent.resolve() != Path(config.MYDOWNLOADS).resolve():
+        return
+    md5 = UrlProps(url).get_md5()
+    if md5 is None:
+        # Peers couldn't check it against the source anyway.
+        return
+    try:
+        st = file_path.lstat()
+    except OSError:
+        return
+    if not stat.S_ISREG(st.st_mode):
+        return
+    with artifact_index_lock:
+        index = read_json_file(config.ARTIFACT_INDEX_FILE) or {}
+        index[file_path.name] = {
+            'md5': md5,
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+        }
+        write_json_file(config.ARTIFACT_INDEX_FILE, index)
+
+
+class ArtifactRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Read-only access to the verified downloads in MYDOWNLOADS, by name,
+    # for installers on other machines; see serve_artifacts() and
+    # add_served_artifact(). Byte ranges are supported, so peers can
+    # resume and split downloads as with any other server.
+    protocol_version = 'HTTP/1.1'
+    server_version = 'LogosLinuxInstaller'
+    sys_version = ''
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()}: {format % args}")
+
+    def open_artifact(self):
+        # Return (open file, its index entry), or None if the name isn't a
+        # verified download that is still unchanged. Symlinks are refused.
+        name = unquote(urlparse(self.path).path).lstrip('/')
+        if not name or '/' in name or name.startswith('.'):
+            return None
+        entry = (read_json_file(config.ARTIFACT_INDEX_FILE) or {}).get(name)
+        if not isinstance(entry, dict) or not entry.get('md5'):
+            return None
+        file_path = Path(config.MYDOWNLOADS) / name
+        try:
+            fd = os.open(file_path, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
+        f = os.fdopen(fd, 'rb')
+        st = os.fstat(fd)
+        if (
+            not stat.S_ISREG(st.st_mode)
+            or st.st_size != entry.get('size')
+            or st.st_mtime_ns != entry.get('mtime_ns')
+        ):
+            # Replaced or changed since it was verified.
+            f.close()
+            return None
+        return f, entry
+
+    def send_file_headers(self):
+        # Send the response headers; return (file, start, end) if the body
+        # should follow. The caller closes the file.
+        artifact = self.open_artifact()
+        if artifact is None:
+            self.send_error(404)
+            return None
+        f, entry = artifact
+        md5 = entry.get('md5')
+        etag = f'"{b64decode(md5).hex()}"'
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        start = 0
+        end = size - 1
+        status = 200
+        byte_range = self.headers.get('Range')
+        if byte_range and self.headers.get('If-Range') in [None, etag]:
+            m = re.fullmatch(r'bytes=(\d+)-(\d*)', byte_range.strip())
+            if (
+                m is None
+                or int(m[1]) >= size
+                or (m[2] and int(m[2]) < int(m[1]))
+            ):
+                f.close()
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{size}")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+            start = int(m[1])
+            if m[2]:
+                end = min(int(m[2]), end)
+            status = 206
+        self.send_response(status)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Content-MD5', md5)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))  # noqa: E501
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        return f, start, end
+
+    def do_HEAD(self):
+        headers_sent = self.send_file_headers()
+        if headers_sent is not None:
+            headers_sent[0].close()
+
+    def do_GET(self):
+        headers_sent = self.send_file_headers()
+        if headers_sent is None:
+            return
+        f, start, end = headers_sent
+        with f:
+            self.connection.sendfile(f, offset=start, count=end - start + 1)
+
+
+def serve_artifacts():
+    # Share verified downloads in MYDOWNLOADS read-only over HTTP with
+    # other machines, which list this one in DOWNLOAD_PEERS.
+    address = config.ARTIFACT_SERVER_ADDRESS or ''
+    port = int(config.ARTIFACT_SERVER_PORT)
+    server = http.server.ThreadingHTTPServer((address, port), ArtifactRequestHandler)  # noqa: E501
+    server.daemon_threads = True
+    index = read_json_file(config.ARTIFACT_INDEX_FILE) or {}
+    msg.logos_msg(f"Serving {len(index)} verified downloads from {config.MYDOWNLOADS} on {address or '*'}:{port}. Press Ctrl+C to stop.")  # noqa: E501
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+
+
 def cli_download(uri, destination):
     message = f"Downloading '{uri}' to '{destination}'"
     logging.info(message)
@@ -153,18 +1521,12 @@ def cli_download(uri, destination):
         msg.logos_error('Interrupted with Ctrl+C')
 
 
-def logos_reuse_download(
-    sourceurl,
-    file,
-    targetdir,
-    app=None,
-):
+def find_verified_file(sourceurl, file, app=None):
     dirs = [
         config.INSTALLDIR,
         os.getcwd(),
         config.MYDOWNLOADS,
     ]
-    found = 1
     for i in dirs:
         if i is not None:
             logging.debug(f"Checking {i} for {file}.")
@@ -177,16 +1539,29 @@ def logos_reuse_download(
                     app=app,
                 ):
                     logging.info(f"{file} properties match. Using it…")
-                    msg.logos_msg(f"Copying {file} into {targetdir}")
-                    try:
-                        shutil.copy(os.path.join(i, file), targetdir)
-                    except shutil.SameFileError:
-                        pass
-                    found = 0
-                    break
+                    return file_path
                 else:
                     logging.info(f"Incomplete file: {file_path}.")
-    if found == 1:
+    if config.MYDOWNLOADS is not None:
+        file_path = Path(config.MYDOWNLOADS) / file
+        return find_stored_artifact(sourceurl, file_path, app=app)
+
+
+def logos_reuse_download(
+    sourceurl,
+    file,
+    targetdir,
+    app=None,
+):
+    # Use the result of a queued background download if there is one.
+    file_path = download_manager.wait(sourceurl, app=app)
+    if file_path is None:
+        file_path = find_verified_file(sourceurl, file, app=app)
+    if file_path is not None:
+        msg.logos_msg(f"Copying {file} into {targetdir}")
+        placed_path = utils.place_file(file_path, targetdir)
+        store_artifact(sourceurl, file_path, placed_path)
+    else:
         file_path = os.path.join(config.MYDOWNLOADS, file)
         if config.DIALOG == 'tk' and app:
             # Ensure progress bar.
@@ -205,58 +1580,311 @@ def logos_reuse_download(
             app=app,
         ):
             msg.logos_msg(f"Copying: {file} into: {targetdir}")
-            try:
-                shutil.copy(os.path.join(config.MYDOWNLOADS, file), targetdir)
-            except shutil.SameFileError:
-                pass
+            placed_path = utils.place_file(file_path, targetdir)
+            store_artifact(sourceurl, file_path, placed_path)
         else:
+            # Don't trust cached metadata for the next attempt.
+            forget_cached_url_headers(sourceurl)
             msg.logos_error(f"Bad file size or checksum: {file_path}")
 
 
-def net_get(url, target=None, app=None, evt=None, q=None):
+def logos_reuse_download_extract(
+    sourceurl,
+    file,
+    output_dir,
+    rename=None,
+    app=None,
+):
+    # Like logos_reuse_download, but unpack the tarball into output_dir.
+    # If it still has to be downloaded it is unpacked while it downloads;
+    # a copy is kept in MYDOWNLOADS either way.
+    file_path = download_manager.wait(sourceurl, app=app)
+    if file_path is None:
+        file_path = find_verified_file(sourceurl, file, app=app)
+    if file_path is None and get_journal_path(Path(config.MYDOWNLOADS) / file).is_file():  # noqa: E501
+        # Resuming a partial download beats streaming it all again.
+        logos_reuse_download(sourceurl, file, config.MYDOWNLOADS, app=app)
+        file_path = Path(config.MYDOWNLOADS) / file
+    if file_path is not None:
+        msg.logos_msg(f"Extracting: {file} into: {output_dir}")
+        utils.untar_file(file_path, output_dir, rename=rename)
+        store_artifact(sourceurl, file_path)
+        return
 
-    # TODO:
-    # - Check available disk space before starting download
+    file_path = Path(config.MYDOWNLOADS) / file
+    msg.logos_msg(f"Downloading and extracting: {file} into: {output_dir}")
+    if config.DIALOG == 'tk' and app:
+        app.stop_indeterminate_progress()
+        net_get_untar(sourceurl, output_dir, file_path, rename, app=app)
+    else:
+        cli_queue = queue.Queue()
+        t = utils.start_thread(
+            net_get_untar,
+            sourceurl,
+            output_dir,
+            file_path,
+            rename,
+            q=cli_queue,
+        )
+        try:
+            while t.is_alive() or not cli_queue.empty():
+                try:
+                    utils.write_progress_bar(cli_queue.get(timeout=0.1))
+                except queue.Empty:
+                    continue
+            print()
+        except KeyboardInterrupt:
+            print()
+            msg.logos_error('Interrupted with Ctrl+C')
+    if not verify_downloaded_file(sourceurl, file_path, app=app):
+        # Finish the download with retries, resuming what the stream got,
+        # and extract it again from the complete file.
+        logging.info(f"Streaming {file} failed; downloading it again.")
+        forget_cached_url_headers(sourceurl)
+        logos_reuse_download(sourceurl, file, config.MYDOWNLOADS, app=app)
+        msg.logos_msg(f"Extracting: {file} into: {output_dir}")
+        utils.untar_file(file_path, output_dir, rename=rename)
+    else:
+        store_artifact(sourceurl, file_path)
+
+
+def download_artifact(url, file, q=None, cancel_evt=None):
+    # Non-interactive download for DownloadManager; returns the verified
+    # file path or None.
+    file_path = find_verified_file(url, file)
+    if file_path is not None:
+        return file_path
+    file_path = Path(config.MYDOWNLOADS) / file
+    net_get(url, target=file_path, q=q, cancel_evt=cancel_evt)
+    if cancel_evt is not None and cancel_evt.is_set():
+        return None
+    if verify_downloaded_file(url, file_path):
+        store_artifact(url, file_path)
+        return file_path
+    forget_cached_url_headers(url)
+    logging.error(f"Bad file size or checksum: {file_path}")
+
+
+def send_progress(percent, app=None, evt=None, q=None):
+    if app:
+        # Send progress value to tk window.
+        app.get_q.put(percent)
+        if not evt:
+            evt = app.get_evt
+        app.root.event_generate(evt)
+    elif q is not None:
+        # Send progress value to queue param.
+        q.put(percent)
+
+
+def net_get(url, target=None, app=None, evt=None, q=None, cancel_evt=None):  # noqa: E501
     logging.debug(f"Download source: {url}")
     logging.debug(f"Download destination: {target}")
+    rate_limiter.set_rate(get_rate_limit())
     target = FileProps(target)  # sets path and size attribs
     if app and target.path:
         app.status_q.put(f"Downloading {target.path.name}…")  # noqa: E501
         app.root.event_generate('<<UpdateStatus>>')
     parsed_url = urlparse(url)
     domain = parsed_url.netloc  # Gets the requested domain
-    url = UrlProps(url)  # uses requests to set headers, size, md5 attribs
+    # Set headers, size, md5 attribs; peers are asked for the file by name.
+    file_name = target.path.name if target.path is not None else None
+    url = UrlProps(url, file=file_name)
     if url.headers is None:
         logging.critical("Could not get headers.")
         return None
 
+    if target.path is None:  # return url content as text
+        try:
+            with get_session().get(url.path, headers={'Accept-Encoding': 'identity'}, timeout=get_timeout()) as r:  # noqa: E501
+                if callable(r):
+                    logging.error("Failed to retrieve data from the URL.")
+                    return None
+
+                try:
+                    r.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    if domain == "github.com":
+                        if (
+                            e.response.status_code == 403
+                            or e.response.status_code == 429
+                        ):
+                            logging.error("GitHub API rate limit exceeded. Please wait before trying again.")  # noqa: E501
+                    else:
+                        logging.error(f"HTTP error occurred: {e.response.status_code}")  # noqa: E501
+                    return None
+
+                return r._content  # raw bytes
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error occurred during HTTP request: {e}")
+            return None
+        except Exception as e:
+            msg.logos_error(e)
+        except KeyboardInterrupt:
+            print()
+            msg.logos_error("Killed with Ctrl+C")
+
+    # Every attempt resumes from what the .part file already holds, so a
+    # dropped connection only costs the time to reconnect. A failed source
+    # is swapped for the next one (mirror, origin); once all have failed
+    # the next round waits an increasing, jittered delay. Only attempts
+    # that don't add to what can be resumed count against DOWNLOAD_RETRIES.
+    stats = TransferStats(url.path, target.path)
+    attempt = 0
+    while True:
+        resume_offset = get_resume_offset(url, target.path)
+        result = net_get_attempt(
+            url,
+            target,
+            stats,
+            app=app,
+            evt=evt,
+            q=q,
+            cancel_evt=cancel_evt,
+        )
+        if result in ['ok', 'cancelled']:
+            break
+        if get_resume_offset(url, target.path) > resume_offset:
+            attempt = 0
+        elif attempt >= int(config.DOWNLOAD_RETRIES):
+            logging.error(f"Giving up on {url.origin} after {attempt + 1} attempts.")  # noqa: E501
+            break
+        failed_path = url.path
+        switched = url.failover()
+        if result == 'failed' and not switched:
+            # The server refused the request; asking again won't help.
+            break
+        attempt += 1
+        stats.retries += 1
+        if switched:
+            continue
+        delay = get_retry_delay(attempt)
+        logging.info(f"Retrying {failed_path} in {delay:.1f}s (retry {stats.retries}).")  # noqa: E501
+        if cancel_evt is None:
+            time.sleep(delay)
+        elif cancel_evt.wait(delay):
+            result = 'cancelled'
+            break
+    stats.url = url.path
+    stats.finish(result)
+    if result == 'cancelled':
+        logging.info(f"Download of {target.path} cancelled.")
+    return None
+
+
+def get_resume_offset(url, file_path):
+    # Bytes of file_path's download that the next attempt won't fetch
+    # again: none if the source can't resume, since it restarts each time.
+    if url.headers is None or url.headers.get('Accept-Ranges') != 'bytes':
+        return 0
+    journal = read_json_file(get_journal_path(file_path))
+    part_path = get_part_path(file_path)
+    if journal is None or not part_path.is_file():
+        return 0
+    segments = journal.get('segments')
+    if segments:
+        return sum(s.get('done') for s in segments)
+    return part_path.stat().st_size
+
+
+def get_retry_delay(attempt):
+    # Exponential backoff with jitter, so that clients that failed together
+    # don't all retry together.
+    delay = float(config.DOWNLOAD_RETRY_DELAY) * 2 ** (attempt - 1)
+    delay = min(delay, RETRY_MAX_DELAY)
+    return random.uniform(delay / 2, delay)
+
+
+def is_retryable(e):
+    # Dropped connections, timeouts and server errors may pass; other HTTP
+    # errors won't.
+    response = getattr(e, 'response', None)
+    if response is None:
+        return True
+    return response.status_code >= 500 or response.status_code in [408, 429]
+
+
+def net_get_attempt(url, target, stats, app=None, evt=None, q=None, cancel_evt=None):  # noqa: E501
+    # Download url to target.path once. Returns 'ok' or 'cancelled';
+    # 'error' and 'incomplete' are worth retrying, 'failed' is not.
+    if url.headers is None:
+        return 'error'
+
     # Initialize variables.
     local_size = 0
     total_size = url.size  # None or int
     logging.debug(f"File size on server: {total_size}")
     percent = None
-    chunk_size = 100 * 1024  # 100 KB default
-    if type(total_size) is int:
-        # Use smaller of 2% of filesize or 2 MB for chunk_size.
-        chunk_size = min([int(total_size / 50), 2 * 1024 * 1024])
+    validator = get_validator(url.headers)
+
+    # Files are downloaded to a .part file next to the target, which is
+    # renamed into place when complete; a journal records what the .part
+    # file holds so that it can be resumed safely.
+    part_path = get_part_path(target.path)
+    journal_path = get_journal_path(target.path)
+    journal = load_download_journal(journal_path, url)
+    if journal is None:
+        part_path.unlink(missing_ok=True)
+
+    # Split large, resumable downloads into concurrent byte-range segments.
+    if can_segment(url, target, journal):
+        return net_get_segmented(
+            url,
+            target,
+            stats,
+            journal,
+            app=app,
+            evt=evt,
+            q=q,
+            cancel_evt=cancel_evt,
+        )
+
     # Force non-compressed file transfer for accurate progress tracking.
     headers = {'Accept-Encoding': 'identity'}
     file_mode = 'wb'
 
-    # If file exists and URL is resumable, set download Range.
-    if target.path is not None and target.path.is_file():
-        logging.debug(f"File exists: {str(target.path)}")
-        local_size = target.get_size()
+    # If a journaled .part file exists and URL is resumable, set download
+    # Range. If-Range makes the server send the whole file instead if it
+    # has changed since the .part file was started.
+    # Otherwise the file is overwritten, and local_size counts from zero.
+    if journal is not None:
+        logging.debug(f"Partial file exists: {str(part_path)}")
+        local_size = part_path.stat().st_size
         logging.info(f"Current downloaded size in bytes: {local_size}")
-        if url.headers.get('Accept-Ranges') == 'bytes':
+        if type(total_size) is int and local_size == total_size:
+            # Interrupted between the last write and the rename; there's
+            # nothing left to request (it would get a 416). The caller
+            # verifies the file.
+            logging.info(f"{part_path} is already complete.")
+            hashers = get_hashers()
+            hash_file(part_path, hashers)
+            os.replace(part_path, target.path)
+            journal_path.unlink(missing_ok=True)
+            set_cached_file_digests(
+                target.path,
+                **get_hasher_digests(hashers)
+            )
+            return 'ok'
+        if type(total_size) is int and local_size > total_size:
+            logging.info(f"{part_path} is larger than {url.path}; restarting download.")  # noqa: E501
+            local_size = 0
+        elif url.headers.get('Accept-Ranges') == 'bytes':
             logging.debug("Server accepts byte range; attempting to resume download.")  # noqa: E501
             file_mode = 'ab'
             if type(url.size) is int:
                 headers['Range'] = f'bytes={local_size}-{total_size}'
             else:
                 headers['Range'] = f'bytes={local_size}-'
+            if validator is not None:
+                headers['If-Range'] = validator
+        else:
+            local_size = 0
 
-    logging.debug(f"{chunk_size=}; {file_mode=}; {headers=}")
+    logging.debug(f"{file_mode=}; {headers=}")
+
+    # Fail now rather than after minutes of downloading.
+    if type(total_size) is int:
+        check_disk_space(target.path, total_size - local_size)
 
     # Log download type.
     if 'Range' in headers.keys():
@@ -264,60 +1892,632 @@ def net_get(url, target=None, app=None, evt=None, q=None):
     else:
         message = f"Starting new download for {url.path}."
     logging.info(message)
+    if not stats.retries:
+        stats.resumed_from = local_size
 
     # Initiate download request.
     try:
-        if target.path is None:  # return url content as text
-            with requests.get(url.path, headers=headers) as r:
-                if callable(r):
-                    logging.error("Failed to retrieve data from the URL.")
-                    return None
-
-                try:
-                    r.raise_for_status()
-                except requests.exceptions.HTTPError as e:
-                    if domain == "github.com":
-                        if (
-                            e.response.status_code == 403
-                            or e.response.status_code == 429
-                        ):
-                            logging.error("GitHub API rate limit exceeded. Please wait before trying again.")  # noqa: E501
-                    else:
-                        logging.error(f"HTTP error occurred: {e.response.status_code}")  # noqa: E501
-                    return None
-
-                return r._content  # raw bytes
-        else:  # download url to target.path
-            with requests.get(url.path, stream=True, headers=headers) as r:
-                with target.path.open(mode=file_mode) as f:
-                    if file_mode == 'wb':
-                        mode_text = 'Writing'
-                    else:
-                        mode_text = 'Appending'
-                    logging.debug(f"{mode_text} data to file {target.path}.")
-                    for chunk in r.iter_content(chunk_size=chunk_size):
-                        f.write(chunk)
-                        local_size = target.get_size()
-                        if type(total_size) is int:
-                            percent = round(local_size / total_size * 100)
-                            # if None not in [app, evt]:
-                            if app:
-                                # Send progress value to tk window.
-                                app.get_q.put(percent)
-                                if not evt:
-                                    evt = app.get_evt
-                                app.root.event_generate(evt)
-                            elif q is not None:
-                                # Send progress value to queue param.
-                                q.put(percent)
-    except requests.exceptions.RequestException as e:
+        save_download_journal(journal_path, url)
+        with get_session().get(url.path, stream=True, headers=headers, timeout=get_timeout()) as r:  # noqa: E501
+            if file_mode == 'ab' and r.status_code == 416:
+                # The .part file doesn't fit the file on the server; start
+                # over rather than asking for the same range again.
+                logging.info(f"{url.path} can't resume {part_path}; restarting download.")  # noqa: E501
+                part_path.unlink(missing_ok=True)
+                journal_path.unlink(missing_ok=True)
+                return 'error'
+            r.raise_for_status()
+            if file_mode == 'ab' and r.status_code != 206:
+                logging.info(f"{url.path} has changed; restarting download.")  # noqa: E501
+                file_mode = 'wb'
+                local_size = 0
+                if not stats.retries:
+                    stats.resumed_from = 0
+                # The cached size and MD5 are for the old file; verify
+                # against the one being downloaded now.
+                forget_cached_url_headers(url.origin)
+                forget_cached_url_headers(url.path)
+                url.headers = r.headers
+                url.size = None
+                url.md5 = None
+                url.get_size()
+                url.get_md5()
+                total_size = url.size
+                set_cached_url_headers(url.path, r.headers)
+                save_download_journal(journal_path, url)
+            hashers = get_hashers()
+            if file_mode == 'ab':
+                # Seed digests with the bytes already downloaded.
+                hash_file(part_path, hashers)
+            # Unbuffered, so each write goes straight from the buffer.
+            with part_path.open(mode=file_mode, buffering=0) as f:
+                if file_mode == 'wb':
+                    mode_text = 'Writing'
+                else:
+                    mode_text = 'Appending'
+                logging.debug(f"{mode_text} data to file {target.path}.")
+                chunks = iter_response(r, cancel_evt=cancel_evt, stats=stats)  # noqa: E501
+                for chunk in chunks:
+                    f.write(chunk)
+                    update_hashers(hashers, chunk)
+                    local_size += len(chunk)
+                    if type(total_size) is int:
+                        new_percent = round(local_size / total_size * 100)  # noqa: E501
+                        if new_percent != percent:
+                            percent = new_percent
+                            send_progress(percent, app=app, evt=evt, q=q)
+            if cancel_evt is not None and cancel_evt.is_set():
+                return 'cancelled'
+            if type(total_size) is int and local_size != total_size:
+                logging.info(f"Download incomplete; partial file kept at {part_path}.")  # noqa: E501
+                return 'incomplete'
+            os.replace(part_path, target.path)
+            journal_path.unlink(missing_ok=True)
+            # Digests are recorded against the finished file's stat
+            # fingerprint so that verification doesn't re-read it.
+            set_cached_file_digests(
+                target.path,
+                **get_hasher_digests(hashers)
+            )
+            return 'ok'
+    except TRANSFER_ERRORS as e:
         logging.error(f"Error occurred during HTTP request: {e}")
-        return None  # Return None values to indicate an error condition
+        if is_retryable(e):
+            return 'error'
+        return 'failed'
     except Exception as e:
-        msg.logos_error(e)
+        fail_download(str(e))
+    except KeyboardInterrupt:
+        print()
+        msg.logos_error("Killed with Ctrl+C")
+
+
+class ResponseReader(io.RawIOBase):
+    # Read-only file object over a streamed response, for tarfile's stream
+    # mode. Everything read is also hashed, written to a copy if one is
+    # given, and counted for progress.
+    def __init__(self, r, copy=None, total_size=None, app=None, evt=None, q=None, stats=None):  # noqa: E501
+        self.chunks = iter_response(r, stats=stats)
+        self.pending = b''
+        self.copy = copy
+        self.hashers = get_hashers()
+        self.total_size = total_size
+        self.size = 0
+        self.percent = None
+        self.app = app
+        self.evt = evt
+        self.q = q
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        # The pending chunk is a slice of iter_response's reused buffer; it
+        # is used up before the next chunk is fetched.
+        while not self.pending:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            if self.copy is not None:
+                self.copy.write(chunk)
+            update_hashers(self.hashers, chunk)
+            self.size += len(chunk)
+            if type(self.total_size) is int:
+                percent = round(self.size / self.total_size * 100)
+                if percent != self.percent:
+                    self.percent = percent
+                    send_progress(percent, app=self.app, evt=self.evt, q=self.q)  # noqa: E501
+            self.pending = chunk
+        n = min(len(b), len(self.pending))
+        b[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+    def drain(self):
+        # Read whatever follows the end of the archive (e.g. tar padding),
+        # so the copy and digests cover the whole file.
+        buf = bytearray(TRANSFER_BUFFER_SIZE)
+        while self.readinto(buf):
+            pass
+
+
+class RemoteFile(io.RawIOBase):
+    # Seekable, read-only file object over a url, read with Range requests.
+    # zipfile only reads the end of central directory record, the central
+    # directory and the members asked for, so one member of a large remote
+    # zip costs a few small requests instead of the whole download.
+    def __init__(self, url, size):
+        self.url = url
+        self.size = size
+        self.pos = 0
+        self.window_start = 0
+        self.window = b''  # last fetched range, to serve small reads
+        self.fetched = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.pos = max(0, offset)
+        return self.pos
+
+    def readinto(self, b):
+        n = min(len(b), self.size - self.pos)
+        if n <= 0:
+            return 0
+        window_end = self.window_start + len(self.window)
+        if not self.window_start <= self.pos <= self.pos + n <= window_end:
+            end = min(self.size, self.pos + max(n, REMOTE_READ_SIZE)) - 1
+            headers = {
+                'Accept-Encoding': 'identity',
+                'Range': f"bytes={self.pos}-{end}",
+            }
+            r = get_session().get(
+                self.url,
+                headers=headers,
+                timeout=get_timeout(),
+            )
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise OSError(f"Server ignored byte range for {self.url}.")
+            self.window_start = self.pos
+            self.window = r.content
+            self.fetched += len(r.content)
+        data = self.window[self.pos - self.window_start:][:n]
+        b[:len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+
+def extract_remote_zip_member(url, select, output_dir):
+    # Extract the first file in the zip at url for which select(ZipInfo)
+    # is true into output_dir, without downloading the rest of the zip.
+    # Returns the extracted path, or None if the server can't serve byte
+    # ranges or the member couldn't be read; then download the whole zip.
+    url = UrlProps(url)
+    if url.headers is None:
+        return None
+    if url.headers.get('Accept-Ranges') != 'bytes' or type(url.size) is not int:  # noqa: E501
+        logging.info(f"{url.path} can't be read remotely; downloading the whole file.")  # noqa: E501
+        return None
+    try:
+        remote_file = RemoteFile(url.path, url.size)
+        with zipfile.ZipFile(remote_file) as z:
+            for zi in z.infolist():
+                if zi.is_dir() or not select(zi):
+                    continue
+                zi.filename = Path(zi.filename).name
+                member_path = z.extract(zi, path=output_dir)
+                logging.info(f"Extracted {zi.filename} from {url.path}; read {remote_file.fetched} of {url.size} bytes.")  # noqa: E501
+                return member_path
+        logging.error(f"No matching file found in {url.path}.")
+    except (requests.exceptions.RequestException, zipfile.BadZipFile, OSError) as e:  # noqa: E501
+        logging.warning(f"Failed to read {url.path} remotely: {e}")
+    return None
+
+
+def net_get_untar(url, output_dir, target=None, rename=None, app=None, evt=None, q=None):  # noqa: E501
+    # Stream a .tar.gz from url straight into output_dir, so members are
+    # written to their final place while the rest is still downloading.
+    # With a target the archive is also saved there. Returns True if the
+    # download matched the server's size and MD5.
+    logging.debug(f"Download and extract source: {url}")
+    logging.debug(f"Extraction destination: {output_dir}")
+    rate_limiter.set_rate(get_rate_limit())
+    if target is not None:
+        target = Path(target)
+    url = UrlProps(url, file=target.name if target is not None else None)
+    if url.headers is None:
+        logging.critical("Could not get headers.")
+        return False
+    if target is not None:
+        part_path = get_part_path(target)
+        journal_path = get_journal_path(target)
+        part_path.unlink(missing_ok=True)
+        if type(url.size) is int:
+            check_disk_space(target, url.size)
+        # The copy is written in order, so net_get can resume it if the
+        # stream breaks.
+        save_download_journal(journal_path, url)
+    os.makedirs(output_dir, exist_ok=True)
+    logging.info(f"Starting new download and extraction for {url.path}.")
+    headers = {'Accept-Encoding': 'identity'}
+    copy = None
+    stats = TransferStats(url.path, target)
+    try:
+        with get_session().get(url.path, stream=True, headers=headers, timeout=get_timeout()) as r:  # noqa: E501
+            r.raise_for_status()
+            if target is not None:
+                copy = part_path.open('wb', buffering=0)
+            reader = ResponseReader(r, copy, url.size, app=app, evt=evt, q=q, stats=stats)  # noqa: E501
+            with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+                utils.extract_tar_members(tar, output_dir, rename=rename)
+            reader.drain()
+    except (*TRANSFER_ERRORS, tarfile.TarError) as e:
+        logging.error(f"Error occurred during download and extraction: {e}")  # noqa: E501
+        stats.finish('error')
+        return False
+    except KeyboardInterrupt:
+        print()
+        msg.logos_error("Killed with Ctrl+C")
+    finally:
+        if copy is not None:
+            copy.close()
+
+    digests = get_hasher_digests(reader.hashers)
+    if type(url.size) is int and reader.size != url.size:
+        logging.error(f"{url.path} ended early at byte {reader.size}.")
+        stats.finish('incomplete')
+        return False
+    stats.finish('ok')
+    if url.md5 is not None and digests.get('md5') != url.md5:
+        logging.error(f"{url.path} has the wrong MD5 sum.")
+        if target is not None:
+            part_path.unlink(missing_ok=True)
+            journal_path.unlink(missing_ok=True)
+        return False
+    if target is not None:
+        os.replace(part_path, target)
+        journal_path.unlink(missing_ok=True)
+        set_cached_file_digests(target, **digests)
+    logging.debug(f"Download and extraction of {url.path} complete.")
+    return True
+
+
+def iter_response(r, limit=None, cancel_evt=None, stats=None):
+    # Yield the response body as slices of one reused buffer, optionally
+    # stopping after limit bytes or when cancel_evt is set. A slice is only
+    # valid until the next one is requested, so callers must consume it
+    # (write, hash) before iterating. Reads are counted in stats, if given.
+    if stats is not None:
+        stats.response(r)
+    raw = getattr(r.raw, '_fp', None)  # http.client response
+    encoding = r.headers.get('Content-Encoding', 'identity')
+    if not hasattr(raw, 'readinto') or encoding != 'identity':
+        # Let requests decode compressed content.
+        chunks = r.iter_content(chunk_size=TRANSFER_BUFFER_SIZE)
+        while True:
+            read_start = time.monotonic()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            if stats is not None:
+                stats.add(len(chunk), time.monotonic() - read_start)
+            progress_meter.add(len(chunk))
+            if cancel_evt is not None and cancel_evt.is_set():
+                return
+            if limit is not None:
+                chunk = chunk[:limit]
+                limit -= len(chunk)
+            rate_limiter.consume(len(chunk))
+            yield memoryview(chunk)
+            if limit == 0:
+                return
+        return
+    # http.client's readinto fills the buffer directly; urllib3's readinto
+    # reads into a new bytes object and copies it. This relies on urllib3
+    # keeping the http.client response in the private HTTPResponse._fp;
+    # without it, the iter_content branch above is used.
+    buffer = memoryview(bytearray(TRANSFER_BUFFER_SIZE))
+    while limit is None or limit > 0:
+        if cancel_evt is not None and cancel_evt.is_set():
+            return
+        view = buffer
+        if limit is not None and limit < len(buffer):
+            view = buffer[:limit]
+        read_start = time.monotonic()
+        n = raw.readinto(view)
+        if not n:
+            break
+        if stats is not None:
+            stats.add(n, time.monotonic() - read_start)
+        progress_meter.add(n)
+        rate_limiter.consume(n)
+        if limit is not None:
+            limit -= n
+        yield view[:n]
+    # Reading past urllib3 means it never sees the end of the body, and
+    # closing the response would drop the connection. http.client closes
+    # its response once the whole body is read; hand the connection back
+    # to the pool then, as urllib3 would have.
+    if raw.isclosed():
+        r.raw.release_conn()
+
+
+def get_hashers():
+    return {'md5': hashlib.md5(), 'sha256': hashlib.sha256()}
+
+
+def update_hashers(hashers, data):
+    for h in hashers.values():
+        h.update(data)
+
+
+def get_hasher_digests(hashers):
+    # MD5 is base64-encoded to match the Content-MD5 header format.
+    return {
+        'md5': b64encode(hashers.get('md5').digest()).decode('utf-8'),
+        'sha256': hashers.get('sha256').hexdigest(),
+    }
+
+
+def hash_file(file_path, hashers, start=0, end=None, fd=None):
+    # Feed bytes [start, end) of the file to hashers; return the end offset.
+    if fd is None:
+        with Path(file_path).open('rb') as f:
+            return hash_file(file_path, hashers, start, end, fd=f.fileno())
+    offset = start
+    while end is None or offset < end:
+        size = HASH_CHUNK_SIZE
+        if end is not None:
+            size = min(size, end - offset)
+        data = os.pread(fd, size, offset)
+        if not data:
+            break
+        update_hashers(hashers, data)
+        offset += len(data)
+    return offset
+
+
+def check_disk_space(file_path, bytes_required):
+    dest_dir = Path(file_path).parent
+    if bytes_required <= 0 or not dest_dir.is_dir():
+        return
+    if not utils.enough_disk_space(dest_dir, bytes_required):
+        fail_download(f"Not enough free disk space in {dest_dir} to download {Path(file_path).name} ({bytes_required} bytes required).")  # noqa: E501
+
+
+def preallocate(fd, size):
+    # Reserve the file's blocks up front, so a full disk fails immediately
+    # and the file is laid out contiguously where the filesystem allows.
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            fail_download(f"Not enough free disk space to allocate {size} bytes.")  # noqa: E501
+        logging.debug(f"Preallocation not supported; using sparse file: {e}")  # noqa: E501
+        os.ftruncate(fd, size)
+
+
+def get_part_path(file_path):
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.name}.part")
+
+
+def get_journal_path(file_path):
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.name}.part.json")
+
+
+def get_validator(headers):
+    # If-Range needs a strong ETag; otherwise fall back to Last-Modified.
+    etag = headers.get('ETag')
+    if etag is not None and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def load_download_journal(journal_path, url):
+    # Return the journal for a .part file that can be resumed from url, or
+    # None if there is nothing (safe) to resume.
+    journal = read_json_file(journal_path)
+    part_path = journal_path.with_suffix('')
+    if journal is None or not part_path.is_file():
+        return None
+    if journal.get('url') != url.origin or journal.get('size') != url.size:
+        logging.info(f"{part_path} is for a different file.")
+        return None
+    if journal.get('validator') != get_validator(url.headers):
+        # Another source of the same file has validators of its own; the
+        # MD5, if both servers give one, tells whether it's the same file.
+        if url.md5 is None or journal.get('md5') != url.md5:
+            logging.info(f"{url.path} has changed since {part_path} was started.")  # noqa: E501
+            return None
+    return journal
+
+
+def save_download_journal(journal_path, url, segments=None):
+    journal = {
+        'url': url.origin,
+        'size': url.size,
+        'validator': get_validator(url.headers),
+        'md5': url.md5,
+        'segments': segments,
+    }
+    write_json_file(journal_path, journal)
+
+
+def can_segment(url, target, journal):
+    if target.path is None:
+        return False
+    segments = int(config.DOWNLOAD_SEGMENTS)
+    if segments < 2:
+        return False
+    if url.headers.get('Accept-Ranges') != 'bytes':
+        return False
+    if type(url.size) is not int or url.size < 2 * SEGMENT_MIN_SIZE:
+        return False
+    # A partial file without segment state was started by a single-stream
+    # download; let the single-stream code resume it.
+    if journal is not None and journal.get('segments') is None:
+        return False
+    return True
+
+
+def get_segments(total_size, count):
+    count = max(1, min(count, total_size // SEGMENT_MIN_SIZE))
+    seg_size = total_size // count
+    segments = []
+    for i in range(count):
+        start = i * seg_size
+        end = total_size - 1 if i == count - 1 else start + seg_size - 1
+        segments.append({'start': start, 'end': end, 'done': 0})
+    return segments
+
+
+def get_segments_frontier(segments):
+    # Return the end of the contiguous run of downloaded bytes from offset 0.
+    frontier = 0
+    for segment in segments:
+        frontier = segment.get('start') + segment.get('done')
+        if frontier <= segment.get('end'):
+            break
+    return frontier
+
+
+def net_get_segmented(
+    url,
+    target,
+    stats,
+    journal=None,
+    app=None,
+    evt=None,
+    q=None,
+    cancel_evt=None,
+):
+    total_size = url.size
+    part_path = get_part_path(target.path)
+    journal_path = get_journal_path(target.path)
+    validator = get_validator(url.headers)
+    segments = None
+    if journal is not None and part_path.stat().st_size == total_size:
+        segments = journal.get('segments')
+    if segments is None:
+        segments = get_segments(total_size, int(config.DOWNLOAD_SEGMENTS))
+        part_path.unlink(missing_ok=True)
+        # A new file needs room for the whole download; a resumed one was
+        # already allocated.
+        check_disk_space(part_path, total_size)
+        message = f"Starting new download for {url.path} in {len(segments)} segments."  # noqa: E501
+    else:
+        message = f"Continuing download for {url.path} in {len(segments)} segments."  # noqa: E501
+    logging.info(message)
+
+    fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+    lock = threading.Lock()
+    errors = []
+    progress = {
+        'done': sum(s.get('done') for s in segments),
+        'percent': None,
+    }
+    if not stats.retries:
+        stats.resumed_from = progress.get('done')
+    stats.segments = len(segments)
+
+    def get_segment(segment):
+        offset = segment.get('start') + segment.get('done')
+        end = segment.get('end')
+        if offset > end:
+            return
+        headers = {
+            'Accept-Encoding': 'identity',
+            'Range': f"bytes={offset}-{end}",
+        }
+        if validator is not None:
+            headers['If-Range'] = validator
+        try:
+            with get_session().get(url.path, stream=True, headers=headers, timeout=get_timeout()) as r:  # noqa: E501
+                r.raise_for_status()
+                if r.status_code != 206:
+                    raise requests.exceptions.HTTPError(
+                        f"Server ignored byte range for {url.path}, or the file has changed."  # noqa: E501
+                    )
+                chunks = iter_response(
+                    r,
+                    limit=end - offset + 1,
+                    cancel_evt=cancel_evt,
+                    stats=stats,
+                )
+                for chunk in chunks:
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+                    with lock:
+                        segment['done'] += len(chunk)
+                        progress['done'] += len(chunk)
+                        percent = round(progress.get('done') / total_size * 100)  # noqa: E501
+                        if percent != progress.get('percent'):
+                            progress['percent'] = percent
+                            save_download_journal(
+                                journal_path,
+                                url,
+                                segments,
+                            )
+                            send_progress(percent, app=app, evt=evt, q=q)
+                if cancel_evt is not None and cancel_evt.is_set():
+                    return
+                if offset <= end:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Segment ended early at byte {offset} of {url.path}."
+                    )
+        except Exception as e:
+            logging.error(f"Error occurred during segment download: {e}")
+            with lock:
+                errors.append(e)
+
+    hashers = get_hashers()
+    hashed = 0
+    try:
+        preallocate(fd, total_size)
+        save_download_journal(journal_path, url, segments)
+        threads = []
+        for segment in segments:
+            t = threading.Thread(
+                target=get_segment,
+                args=[segment],
+                daemon=True
+            )
+            threads.append(t)
+            t.start()
+        # Hash the contiguous downloaded prefix while segments are still
+        # running; the data is read back from the page cache.
+        while any(t.is_alive() for t in threads):
+            with lock:
+                frontier = get_segments_frontier(segments)
+            hashed = hash_file(part_path, hashers, hashed, frontier, fd=fd)
+            time.sleep(0.1)
+        for t in threads:
+            t.join()
+        if not errors:
+            hashed = hash_file(
+                part_path,
+                hashers,
+                hashed,
+                total_size,
+                fd=fd
+            )
     except KeyboardInterrupt:
         print()
         msg.logos_error("Killed with Ctrl+C")
+    finally:
+        os.close(fd)
+
+    with lock:
+        save_download_journal(journal_path, url, segments)
+    if cancel_evt is not None and cancel_evt.is_set():
+        return 'cancelled'
+    if errors:
+        # The server's headers may be stale if the file changed; get fresh
+        # ones before the next attempt.
+        forget_cached_url_headers(url.origin)
+        logging.info(f"Download incomplete; partial file kept at {part_path}.")  # noqa: E501
+        if any(is_retryable(e) for e in errors):
+            return 'incomplete'
+        return 'failed'
+    os.replace(part_path, target.path)
+    journal_path.unlink(missing_ok=True)
+    set_cached_file_digests(target.path, **get_hasher_digests(hashers))
+    logging.debug(f"Segmented download of {target.path} complete.")
+    return 'ok'
 
 
 def verify_downloaded_file(url, file_path, app=None, evt=None):
@@ -328,6 +2528,10 @@ def verify_downloaded_file(url, file_path, app=None, evt=None):
         # if config.DIALOG == "tk":
         #     app.root.event_generate('<<UpdateStatus>>')
     res = False
+    verify_start = time.monotonic()
+    for u in [url, get_mirror_url(url)]:
+        if u is not None:
+            revalidate_cached_url_headers(u)
     txt = f"{file_path} is the wrong size."
     right_size = same_size(url, file_path)
     if right_size:
@@ -336,7 +2540,15 @@ def verify_downloaded_file(url, file_path, app=None, evt=None):
         if right_md5:
             txt = f"{file_path} is verified."
             res = True
+            add_served_artifact(url, file_path)
     logging.info(txt)
+    log_transfer_event({
+        'event': 'verify',
+        'host': urlparse(url).netloc,
+        'file': str(file_path),
+        'result': 'ok' if res else 'failed',
+        'seconds': round(time.monotonic() - verify_start, 3),
+    })
     if app:
         if config.DIALOG == "tk":
             if not evt:
@@ -370,7 +2582,9 @@ def same_size(url, file_path):
 
 
 def get_latest_release_data(releases_url):
-    data = net_get(releases_url)
+    data = net_get_cached(releases_url)
+    if get_stale_response_time(releases_url) is not None:
+        config.RELEASE_INFO_STALE = True
     if data:
         try:
             json_data = json.loads(data.decode())
@@ -391,7 +2605,12 @@ def get_latest_release_data(releases_url):
 def get_latest_release_url(json_data):
     release_url = None
     if json_data:
-        release_url = json_data[0].get('assets')[0].get('browser_download_url')  # noqa: E501
+        # Skip delta-update chunk indexes published next to the binary.
+        assets = [
+            a for a in json_data[0].get('assets')
+            if not a.get('name', '').endswith('.chunks.json')
+        ]
+        release_url = assets[0].get('browser_download_url')
         logging.info(f"Release URL: {release_url}")
     return release_url
 
@@ -441,6 +2660,65 @@ def set_recommended_appimage_config():
     config.RECOMMENDED_WINE64_APPIMAGE_BRANCH = f"{branch}"
 
 
+def set_icu_release_config():
+    releases_url = "https://api.github.com/repos/FaithLife-Community/icu/releases"  # noqa: E501
+    json_data = get_latest_release_data(releases_url)
+    icu_url = get_latest_release_url(json_data)
+    if icu_url is None:
+        logging.critical("Unable to set ICU release without URL.")
+        return
+    config.ICU_URL = icu_url
+
+
+def resolve_release_config(setter, deadline=None):
+    # Run a set_*_config function in the background, unless it's already
+    # running; it publishes to config as soon as its response arrives.
+    def run():
+        try:
+            with deadline or Deadline():
+                setter()
+        except Exception as e:
+            logging.error(f"{setter.__name__} failed: {e}")
+
+    with release_threads_lock:
+        t = release_threads.get(setter)
+        if t is None or not t.is_alive():
+            t = utils.start_thread(run)
+            release_threads[setter] = t
+    return t
+
+
+def wait_for_release_config(setter):
+    # Let a background lookup started by resolve_release_config finish.
+    with release_threads_lock:
+        t = release_threads.get(setter)
+    if t is not None:
+        t.join()
+
+
+def resolve_release_configs():
+    # Look up all release metadata concurrently, so startup waits for the
+    # slowest endpoint rather than the sum of them, and for no longer than
+    # RELEASE_CHECK_TIMEOUT. Lookups still running then carry on in the
+    # background until UPDATE_CHECK_BUDGET runs out, when they fall back to
+    # cached responses. Returns True if all of them finished in time.
+    setters = [
+        set_logoslinuxinstaller_latest_release_config,
+        set_recommended_appimage_config,
+        set_icu_release_config,
+    ]
+    budget = Deadline(config.UPDATE_CHECK_BUDGET, "Checking for updates")
+    wait_until = time.monotonic() + float(config.RELEASE_CHECK_TIMEOUT)
+    threads = [resolve_release_config(s, budget) for s in setters]
+    for t in threads:
+        t.join(max(0, wait_until - time.monotonic()))
+    late = [s.__name__ for s, t in zip(setters, threads) if t.is_alive()]
+    if late:
+        logging.warning(f"Release lookups still running: {', '.join(late)}; continuing without them.")  # noqa: E501
+        config.RELEASE_INFO_STALE = True
+    return not late and not config.RELEASE_INFO_STALE
+
+
 def check_for_updates():
     # We limit the number of times set_recommended_appimage_config is run in
     # order to avoid GitHub API limits. This sets the check to once every 12
@@ -466,11 +2744,9 @@ def check_for_updates():
     if now >= check_again:
         logging.debug("Running self-update.")
 
-        set_logoslinuxinstaller_latest_release_config()
-        set_recommended_appimage_config()
-
-        config.LAST_UPDATED = now.isoformat()
-        utils.write_config(config.CONFIG_FILE)
+        if resolve_release_configs():
+            config.LAST_UPDATED = now.isoformat()
+            utils.write_config(config.CONFIG_FILE)
     else:
         logging.debug("Skipping self-update.")
 
@@ -487,6 +2763,70 @@ def get_recommended_appimage():
             config.APPDIR_BINDIR)
 
 
+def get_logos_releases_url():
+    # NOTE: This assumes that Verbum release numbers continue to mirror Logos.
+    return f"https://clientservices.logos.com/update/v1/feed/logos{config.TARGETVERSION}/stable.xml"  # noqa: E501
+
+
+def parse_logos_releases(xml_bytes):
+    # iterparse handles one element at a time, so the whole feed tree is
+    # never built; elements are cleared once read.
+    version_tag = '{http://services.logos.com/update/v1/}version'
+    releases = []
+    for event, elem in ET.iterparse(io.BytesIO(xml_bytes)):
+        if elem.tag == version_tag:
+            releases.append(elem.text)
+        elem.clear()
+    return releases
+
+
+def fetch_logos_releases(url):
+    # Revalidate the feed; it's only parsed again if its body changed.
+    response_xml_bytes = net_get_cached(url)
+    if response_xml_bytes is None:
+        return None
+    entry = get_cached_response(url)
+    if entry is not None and entry.get('releases') is not None:
+        return entry.get('releases')
+    try:
+        releases = parse_logos_releases(response_xml_bytes)
+    except ET.ParseError as e:
+        logging.error(f"Error parsing release feed {url}: {e}")
+        return None
+    if entry is not None:
+        entry['releases'] = releases
+        write_json_file(get_response_cache_path(url), entry)
+    return releases
+
+
+def set_logos_releases(version, releases):
+    if version == '9':
+        config.LOGOS9_RELEASES = releases
+    elif version == '10':
+        config.LOGOS10_RELEASES = releases
+
+
+def revalidate_logos_releases(url, version, app=None):
+    with Deadline(config.RELEASE_LIST_BUDGET, "Getting the release list"):
+        releases = fetch_logos_releases(url)
+    if releases is not None and get_stale_response_time(url) is None:
+        logging.debug(f"Revalidated list of v{version} releases.")
+        set_logos_releases(version, releases)
+    else:
+        # The list already shown is the cached one, and it couldn't be
+        # checked; say how old it is.
+        report_stale_logos_releases(url, app=app)
+
+
+def report_stale_logos_releases(url, app=None):
+    entry = get_cached_response(url) or {}
+    fetched = get_stale_response_time(url) or entry.get('time')
+    if fetched is None:
+        return
+    fetched = datetime.fromtimestamp(fetched)
+    msg.status(f"{urlparse(url).netloc} couldn't be reached; showing the release list from {fetched:%Y-%m-%d %H:%M}.", app)  # noqa: E501
+
+
 def get_logos_releases(app=None):
     # Use already-downloaded list if requested again.
     downloaded_releases = None
@@ -494,43 +2834,37 @@ def get_logos_releases(app=None):
         downloaded_releases = config.LOGOS9_RELEASES
     elif config.TARGETVERSION == '10' and config.LOGOS10_RELEASES:
         downloaded_releases = config.LOGOS10_RELEASES
+
+    url = get_logos_releases_url()
+    cached_response = get_cached_response(url)
     if downloaded_releases:
         logging.debug(f"Using already-downloaded list of v{config.TARGETVERSION} releases")  # noqa: E501
-        if app:
-            app.releases_q.put(downloaded_releases)
-            app.root.event_generate(app.release_evt)
-        return downloaded_releases
-
-    msg.logos_msg(f"Downloading release list for {config.FLPRODUCT} {config.TARGETVERSION}…")  # noqa: E501
-    # NOTE: This assumes that Verbum release numbers continue to mirror Logos.
-    url = f"https://clientservices.logos.com/update/v1/feed/logos{config.TARGETVERSION}/stable.xml"  # noqa: E501
-
-    response_xml_bytes = net_get(url)
-    # if response_xml is None and None not in [q, app]:
-    if response_xml_bytes is None:
-        if app:
-            app.releases_q.put(None)
-            if config.DIALOG == 'tk':
-                app.root.event_generate(app.release_evt)
-        return None
-
-    # Parse XML
-    root = ET.fromstring(response_xml_bytes.decode('utf-8-sig'))
-
-    # Define namespaces
-    namespaces = {
-        'ns0': 'http://www.w3.org/2005/Atom',
-        'ns1': 'http://services.logos.com/update/v1/'
-    }
-
-    # Extract versions
-    releases = []
-    # Obtain all listed releases.
-    for entry in root.findall('.//ns1:version', namespaces):
-        release = entry.text
-        releases.append(release)
-        # if len(releases) == 5:
-        #    break
+        releases = downloaded_releases
+    elif cached_response and cached_response.get('releases'):
+        # Show the cached list right away and refresh it for next time.
+        logging.debug(f"Using cached list of v{config.TARGETVERSION} releases")  # noqa: E501
+        releases = cached_response.get('releases')
+        set_logos_releases(config.TARGETVERSION, releases)
+        utils.start_thread(
+            revalidate_logos_releases,
+            url,
+            config.TARGETVERSION,
+            app=app,
+        )
+    else:
+        msg.logos_msg(f"Downloading release list for {config.FLPRODUCT} {config.TARGETVERSION}…")  # noqa: E501
+        with Deadline(config.RELEASE_LIST_BUDGET, "Getting the release list"):  # noqa: E501
+            releases = fetch_logos_releases(url)
+        if releases is not None and get_stale_response_time(url) is not None:  # noqa: E501
+            report_stale_logos_releases(url, app=app)
+        # if releases is None and None not in [q, app]:
+        if releases is None:
+            if app:
+                app.releases_q.put(None)
+                if config.DIALOG == 'tk':
+                    app.root.event_generate(app.release_evt)
+            return None
+        set_logos_releases(config.TARGETVERSION, releases)
 
     # Disabled filtering: with Logos 30+, all versions are known to be working.
     # Keeping code if it needs to be reactivated.
@@ -548,10 +2882,172 @@ def get_logos_releases(app=None):
     return filtered_releases
 
 
+def get_chunks(data, min_size=CHUNK_MIN_SIZE, max_size=CHUNK_MAX_SIZE, marker=CHUNK_MARKER):  # noqa: E501
+    # Split data into (offset, length) chunks, cutting after each marker
+    # that is at least min_size past the previous cut, or at max_size. Cut
+    # points depend only on nearby content, so an insertion or deletion
+    # only changes the chunks around it, and bytes.find keeps this fast.
+    chunks = []
+    start = 0
+    while start < len(data):
+        pos = data.find(marker, start + min_size, start + max_size)
+        if pos == -1:
+            end = min(start + max_size, len(data))
+        else:
+            end = pos + len(marker)
+        chunks.append((start, end - start))
+        start = end
+    return chunks
+
+
+def write_chunk_index(file_path, index_path=None):
+    # Publish the output next to a release binary as <name>.chunks.json to
+    # allow delta updates; see update_file_delta().
+    file_path = Path(file_path)
+    if index_path is None:
+        index_path = file_path.with_name(f"{file_path.name}.chunks.json")
+    data = file_path.read_bytes()
+    index = {
+        'size': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'marker': CHUNK_MARKER.hex(),
+        'min_size': CHUNK_MIN_SIZE,
+        'max_size': CHUNK_MAX_SIZE,
+        'chunks': [
+            [length, hashlib.sha256(data[offset:offset + length]).hexdigest()]  # noqa: E501
+            for offset, length in get_chunks(data)
+        ],
+    }
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+    return index_path
+
+
+def get_chunk_index(index_url):
+    try:
+        r = get_session().get(index_url, timeout=get_timeout())
+    except requests.exceptions.RequestException as e:
+        logging.info(f"Could not get chunk index: {e}")
+        return None
+    if not r.ok:
+        logging.info(f"No chunk index at {index_url}.")
+        return None
+    try:
+        index = r.json()
+        valid = is_valid_chunk_index(index)
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        logging.error(f"Invalid chunk index at {index_url}: {e}")
+        return None
+    if not valid:
+        logging.error(f"Invalid chunk index at {index_url}.")
+        return None
+    return index
+
+
+def is_valid_chunk_index(index):
+    # Raises or returns False for an index that write_chunk_index() didn't
+    # write, e.g. one from an older format.
+    for key in ['size', 'min_size', 'max_size']:
+        if not isinstance(index[key], int):
+            return False
+    if not bytes.fromhex(index['marker']):
+        return False
+    if not isinstance(index['sha256'], str):
+        return False
+    if not 0 < index['min_size'] <= index['max_size']:
+        return False
+    for length, digest in index['chunks']:
+        if not isinstance(length, int) or length <= 0:
+            return False
+        if not isinstance(digest, str):
+            return False
+    return sum(length for length, _ in index['chunks']) == index['size']
+
+
+def update_file_delta(url, index_url, local_path, new_path):
+    # zsync-style update: build the file at url in new_path from the chunks
+    # of local_path that it shares with the published chunk index, fetching
+    # only the rest with Range requests. Returns True if new_path matches
+    # the index's SHA-256; on any failure the caller falls back to a full
+    # download.
+    index = get_chunk_index(index_url)
+    if index is None:
+        return False
+    new_path = Path(new_path)
+    url = UrlProps(url)
+    stats = None
+    try:
+        local_data = Path(local_path).read_bytes()
+        local_chunks = {}
+        chunks = get_chunks(
+            local_data,
+            index.get('min_size'),
+            index.get('max_size'),
+            bytes.fromhex(index.get('marker')),
+        )
+        for offset, length in chunks:
+            digest = hashlib.sha256(local_data[offset:offset + length]).hexdigest()  # noqa: E501
+            local_chunks.setdefault(digest, offset)
+
+        # Copy the chunks we have; collect the others as coalesced ranges.
+        ranges = []  # [start, end] byte ranges to fetch, inclusive
+        offset = 0
+        with new_path.open('wb') as f:
+            f.truncate(index.get('size'))
+            for length, digest in index.get('chunks'):
+                local_offset = local_chunks.get(digest)
+                if local_offset is not None:
+                    f.seek(offset)
+                    f.write(local_data[local_offset:local_offset + length])
+                elif ranges and ranges[-1][1] == offset - 1:
+                    ranges[-1][1] = offset + length - 1
+                else:
+                    ranges.append([offset, offset + length - 1])
+                offset += length
+        del local_data
+
+        fetch_size = sum(end - start + 1 for start, end in ranges)
+        logging.info(f"Delta update: fetching {fetch_size} of {index.get('size')} bytes in {len(ranges)} ranges.")  # noqa: E501
+        stats = TransferStats(url.path, new_path, segments=len(ranges))
+        with new_path.open('r+b', buffering=0) as f:
+            for start, end in ranges:
+                headers = {
+                    'Accept-Encoding': 'identity',
+                    'Range': f"bytes={start}-{end}",
+                }
+                with get_session().get(url.path, stream=True, headers=headers, timeout=get_timeout()) as r:  # noqa: E501
+                    r.raise_for_status()
+                    if r.status_code != 206:
+                        raise requests.exceptions.HTTPError(
+                            f"Server ignored byte range for {url.path}."
+                        )
+                    chunks = iter_response(r, limit=end - start + 1, stats=stats)  # noqa: E501
+                    for chunk in chunks:
+                        os.pwrite(f.fileno(), chunk, start)
+                        start += len(chunk)
+    except (*TRANSFER_ERRORS, OSError) as e:
+        logging.error(f"Delta update failed: {e}")
+        if stats is not None:
+            stats.finish('error')
+        new_path.unlink(missing_ok=True)
+        return False
+    stats.finish('ok')
+
+    hashers = {'sha256': hashlib.sha256()}
+    hash_file(new_path, hashers)
+    if hashers.get('sha256').hexdigest() != index.get('sha256'):
+        logging.error(f"Delta update of {new_path} has the wrong SHA-256 sum.")  # noqa: E501
+        new_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
 def update_lli_binary(app=None):
-    lli_file_path = os.path.realpath(sys.argv[0])
+    lli_file_path = Path(os.path.realpath(sys.argv[0]))
     lli_download_path = Path(config.MYDOWNLOADS) / "LogosLinuxInstaller"
-    temp_path = Path(config.MYDOWNLOADS) / "LogosLinuxInstaller.tmp"
+    # Build the new binary next to the old one, so that replacing it is a
+    # single atomic rename.
+    new_path = lli_file_path.with_name(f".{lli_file_path.name}.new")
     logging.debug(
         f"Updating Logos Linux Installer to latest version by overwriting: {lli_file_path}")  # noqa: E501
 
@@ -564,19 +3060,31 @@ def update_lli_binary(app=None):
             # Remove incompatible file.
             lli_download_path.unlink()
 
-    logos_reuse_download(
+    # Unless the new binary is already downloaded, fetch only the parts of
+    # it that differ from the running one.
+    index_url = f"{config.LOGOS_LATEST_VERSION_URL}.chunks.json"
+    delta_updated = not lli_download_path.is_file() and update_file_delta(
         config.LOGOS_LATEST_VERSION_URL,
-        "LogosLinuxInstaller",
-        config.MYDOWNLOADS,
-        app=app,
+        index_url,
+        lli_file_path,
+        new_path,
     )
-    shutil.copy(lli_download_path, temp_path)
+    if not delta_updated:
+        logos_reuse_download(
+            config.LOGOS_LATEST_VERSION_URL,
+            "LogosLinuxInstaller",
+            config.MYDOWNLOADS,
+            app=app,
+        )
     try:
-        shutil.move(temp_path, lli_file_path)
-    except Exception as e:
+        if not delta_updated:
+            utils.place_file(lli_download_path, new_path)
+        os.chmod(new_path, lli_file_path.stat().st_mode | 0o111)
+        os.replace(new_path, lli_file_path)
+    except OSError as e:
         logging.error(f"Failed to replace the binary: {e}")
+        new_path.unlink(missing_ok=True)
         return
 
-    os.chmod(sys.argv[0], os.stat(sys.argv[0]).st_mode | 0o111)
     logging.debug("Successfully updated Logos Linux Installer.")
     utils.restart_lli()
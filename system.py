@@ -618,30 +618,49 @@ def check_libs(libraries, app=None):
             return False
 
 
+def get_winetricks_zip(version=config.WINETRICKS_VERSION):
+    base_url = "https://codeload.github.com/Winetricks/winetricks/zip/refs/tags"  # noqa: E501
+    return f"{base_url}/{version}", f"{version}.zip"
+
+
 def install_winetricks(
         installdir,
         app=None,
         version=config.WINETRICKS_VERSION,
 ):
     msg.logos_msg(f"Installing winetricks v{version}…")
-    base_url = "https://codeload.github.com/Winetricks/winetricks/zip/refs/tags"  # noqa: E501
-    zip_name = f"{version}.zip"
-    network.logos_reuse_download(
-        f"{base_url}/{version}",
-        zip_name,
-        config.MYDOWNLOADS,
-        app=app,
-    )
-    wtzip = f"{config.MYDOWNLOADS}/{zip_name}"
-    logging.debug(f"Extracting winetricks script into {installdir}…")
-    with zipfile.ZipFile(wtzip) as z:
-        for zi in z.infolist():
-            if zi.is_dir():
-                continue
-            zi.filename = Path(zi.filename).name
-            if zi.filename == 'winetricks':
-                z.extract(zi, path=installdir)
-                break
+    zip_url, zip_name = get_winetricks_zip(version)
+
+    def is_winetricks(zi):
+        return Path(zi.filename).name == 'winetricks'
+
+    # Only the script is needed, so unless the zip is already here, try to
+    # read just that member from the remote zip.
+    wtbin = None
+    if network.find_verified_file(zip_url, zip_name, app=app) is None:
+        logging.debug(f"Extracting remote winetricks script into {installdir}…")  # noqa: E501
+        wtbin = network.extract_remote_zip_member(
+            zip_url,
+            is_winetricks,
+            installdir,
+        )
+    if wtbin is None:
+        network.logos_reuse_download(
+            zip_url,
+            zip_name,
+            config.MYDOWNLOADS,
+            app=app,
+        )
+        wtzip = f"{config.MYDOWNLOADS}/{zip_name}"
+        logging.debug(f"Extracting winetricks script into {installdir}…")
+        with zipfile.ZipFile(wtzip) as z:
+            for zi in z.infolist():
+                if zi.is_dir():
+                    continue
+                if is_winetricks(zi):
+                    zi.filename = Path(zi.filename).name
+                    z.extract(zi, path=installdir)
+                    break
     os.chmod(f"{installdir}/winetricks", 0o755)
     config.WINETRICKSBIN = f"{installdir}/winetricks"
     logging.debug("Winetricks installed.")
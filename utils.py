@@ -1,4 +1,5 @@
 import atexit
+import fcntl
 import glob
 import inspect
 import json
@@ -440,16 +441,23 @@ def wait_process_using_dir(directory):
     logging.info("* End of wait_process_using_dir.")
 
 
-def write_progress_bar(percent, screen_width=80):
+def write_progress_bar(percent, screen_width=80, detail=None, app=None):
     y = '.'
     n = ' '
     l_f = int(screen_width * 0.75)  # progress bar length
+    if detail:
+        # Make room for e.g. throughput and ETA after the bar.
+        detail = f" {detail}"
+        l_f = max(10, screen_width - len(detail) - 9)
+    else:
+        detail = ''
     l_y = int(l_f * percent / 100)  # num. of chars. complete
     l_n = l_f - l_y  # num. of chars. incomplete
     if config.DIALOG == 'curses':
-        msg.status(f" [{y * l_y}{n * l_n}] {percent:>3}%")
+        msg.status(f" [{y * l_y}{n * l_n}] {percent:>3}%{detail}", app, log=False)  # noqa: E501
     else:
-        print(f" [{y * l_y}{n * l_n}] {percent:>3}%", end='\r')
+        line = f" [{y * l_y}{n * l_n}] {percent:>3}%{detail}"
+        print(line.ljust(screen_width - 1), end='\r')
 
 
 def app_is_installed():
@@ -513,12 +521,31 @@ def get_latest_folder(folder_path):
     return latest
 
 
-def install_premade_wine_bottle(srcdir, appdir):
-    msg.logos_msg(f"Extracting: '{config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME}' into: {appdir}")  # noqa: E501
-    shutil.unpack_archive(
-        f"{srcdir}/{config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME}",
-        appdir
+def install_premade_wine_bottle(appdir, app=None):
+    # Unpack the v9 bottle into appdir/wine64_bottle, while it downloads if
+    # it isn't downloaded yet. It's unpacked into a temporary directory and
+    # renamed into place when complete, so that an interrupted install
+    # doesn't leave a partial prefix that later runs take as installed.
+    appdir = Path(appdir)
+    bottle = appdir / 'wine64_bottle'
+    temp_dir = appdir / '.wine64_bottle.tmp'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    temp_dir.mkdir(parents=True)
+    network.logos_reuse_download_extract(
+        config.LOGOS9_WINE64_BOTTLE_TARGZ_URL,
+        config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME,
+        temp_dir,
+        app=app,
     )
+    if not (temp_dir / 'wine64_bottle' / 'system.reg').is_file():
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        msg.logos_error(f"No wine bottle found in {config.LOGOS9_WINE64_BOTTLE_TARGZ_NAME}.")  # noqa: E501
+    if bottle.is_dir():
+        # Made empty by ensure_install_dirs, or left by an interrupted run;
+        # without system.reg it was never installed.
+        shutil.rmtree(bottle)
+    os.replace(temp_dir / 'wine64_bottle', bottle)
+    temp_dir.rmdir()
 
 
 def compare_logos_linux_installer_version():
@@ -780,7 +807,7 @@ def set_appimage_symlink(app=None):
     appimage_filename = selected_appimage_file_path.name
     if confirm is True or confirm == 'yes':
         logging.info(f"Copying {selected_appimage_file_path} to {config.APPDIR_BINDIR}.")  # noqa: E501
-        shutil.copy(selected_appimage_file_path, f"{config.APPDIR_BINDIR}")
+        place_file(selected_appimage_file_path, config.APPDIR_BINDIR)
         os.symlink(selected_appimage_file_path, appimage_symlink_path)
         config.SELECTED_APPIMAGE_FILENAME = f"{appimage_filename}"
     # If not, use the selected AppImage's full path for link creation.
@@ -881,13 +908,86 @@ def str_array_to_string(text, delimeter="\n"):
         return text
 
 
-def untar_file(file_path, output_dir):
+FICLONE = 0x40049409  # from linux/fs.h
+
+
+def place_file(src, dst, link=True):
+    # Put a copy of src at dst (a file or a directory), as cheaply as the
+    # filesystem allows: a reflink (shared extents, copy-on-write), then a
+    # hardlink if link is True, then an in-kernel copy; shutil.copyfile,
+    # which uses sendfile where it can, is the last resort. The file is
+    # renamed into place, so dst is never seen partly written.
+    src = Path(src)
+    dst = Path(dst)
+    if dst.is_dir():
+        dst = dst / src.name
+    if dst.exists() and os.path.samefile(src, dst):
+        return dst
+    temp_path = dst.with_name(f".{dst.name}.tmp")
+    temp_path.unlink(missing_ok=True)
+    method = None
+    try:
+        with src.open('rb') as fsrc, temp_path.open('wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        method = 'reflink'
+    except OSError as e:
+        logging.debug(f"Can't reflink {src}: {e}")
+        temp_path.unlink(missing_ok=True)
+    if method is None and link:
+        try:
+            os.link(src, temp_path)
+            method = 'hardlink'
+        except OSError as e:
+            logging.debug(f"Can't hardlink {src}: {e}")
+    if method is None:
+        try:
+            with src.open('rb') as fsrc, temp_path.open('wb') as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)  # noqa: E501
+                    if n == 0:
+                        break
+                    copied += n
+            if copied == size:
+                method = 'copy_file_range'
+        except (AttributeError, OSError) as e:
+            logging.debug(f"Can't copy_file_range {src}: {e}")
+    if method is None:
+        shutil.copyfile(src, temp_path)
+        method = 'copy'
+    if method != 'hardlink':
+        shutil.copymode(src, temp_path)
+    os.replace(temp_path, dst)
+    logging.debug(f"Placed {src} at {dst} by {method}.")
+    return dst
+
+
+def extract_tar_members(tar, output_dir, rename=None):
+    # Extract members one at a time, in archive order, so that this also
+    # works on a stream-mode ('r|gz') archive. rename(name) can map each
+    # member to a different path under output_dir, or return None to skip.
+    for member in tar:
+        if rename is not None:
+            name = rename(member.name)
+            if name is None:
+                continue
+            member.name = name
+            if member.islnk():
+                member.linkname = rename(member.linkname) or member.linkname
+        tar.extract(member, path=output_dir)
+
+
+def untar_file(file_path, output_dir, rename=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     try:
         with tarfile.open(file_path, 'r:gz') as tar:
-            tar.extractall(path=output_dir)
+            if rename is None:
+                tar.extractall(path=output_dir)
+            else:
+                extract_tar_members(tar, output_dir, rename=rename)
             logging.debug(f"Successfully extracted '{file_path}' to '{output_dir}'")  # noqa: E501
     except tarfile.TarError as e:
         logging.error(f"Error extracting '{file_path}': {e}")
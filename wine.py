@@ -2,7 +2,6 @@ import logging
 import os
 import psutil
 import re
-import shutil
 import signal
 import subprocess
 import time
@@ -309,30 +308,37 @@ def installFonts():
     winetricks_install('-q', 'settings', 'fontsmooth=rgb')
 
 
+def get_icu_data_files_url():
+    # Usually looked up at startup, alongside the other release info.
+    network.wait_for_release_config(network.set_icu_release_config)
+    if config.ICU_URL is None:
+        with network.Deadline(config.UPDATE_CHECK_BUDGET, "Looking up the ICU release"):  # noqa: E501
+            network.set_icu_release_config()
+    return config.ICU_URL
+
+
 def installICUDataFiles(app=None):
-    releases_url = "https://api.github.com/repos/FaithLife-Community/icu/releases"  # noqa: E501
-    json_data = network.get_latest_release_data(releases_url)
-    icu_url = network.get_latest_release_url(json_data)
-    # icu_tag_name = utils.get_latest_release_version_tag_name(json_data)
+    icu_url = get_icu_data_files_url()
     if icu_url is None:
         logging.critical("Unable to set LogosLinuxInstaller release without URL.")  # noqa: E501
         return
     icu_filename = os.path.basename(icu_url)
-    network.logos_reuse_download(
+    drive_c = f"{config.INSTALLDIR}/data/wine64_bottle/drive_c"
+
+    def rename(name):
+        # Write icu-win/windows/* straight into drive_c/windows.
+        name = name.removeprefix('./')
+        if name == 'icu-win/windows' or name.startswith('icu-win/windows/'):
+            return f"windows{name.removeprefix('icu-win/windows')}"
+        return name
+
+    network.logos_reuse_download_extract(
         icu_url,
         icu_filename,
-        config.MYDOWNLOADS,
+        drive_c,
+        rename=rename,
         app=app
     )
-    drive_c = f"{config.INSTALLDIR}/data/wine64_bottle/drive_c"
-    utils.untar_file(f"{config.MYDOWNLOADS}/icu-win.tar.gz", drive_c)
-
-    # Ensure the target directory exists
-    icu_win_dir = f"{drive_c}/icu-win/windows"
-    if not os.path.exists(icu_win_dir):
-        os.makedirs(icu_win_dir)
-
-    shutil.copytree(icu_win_dir, f"{drive_c}/windows", dirs_exist_ok=True)
     if hasattr(app, 'status_evt'):
         app.status_q.put("ICU files copied.")
         app.root.event_generate(app.status_evt)